@@ -16,6 +16,7 @@ from src.schemas.dashboard_schema import ForumUrlSchema
 from src.services.logs_service import LogService, get_log_service
 from src.utils.log import log_action, ActionType
 from src.services.messanger_service import MessangerService, get_messager_service
+from src.utils.password_hasher import password_hasher
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -186,6 +187,11 @@ async def get_general(request: Request):
         "user": jsonable_encoder(user)
     })
 
+@router.get("/password-hash-stats", dependencies=[Depends(RoleLevelChecker(PermissionLevel.EXECUTIVE_MODERATOR))])
+async def get_password_hash_stats():
+    """Очередь и время расчета хэшей паролей (пул потоков bcrypt)"""
+    return password_hasher.stats()
+
 @router.get("/general/logs", dependencies=[Depends(RoleLevelChecker(PermissionLevel.USER))])
 async def get_logs(
     request: Request,
@@ -1,6 +1,6 @@
 from src.utils.security import SecurityUtils
 from src.services.appeal_service import AppealService, get_appeal_service
-from src.services.auth_handler import get_current_user_websoket, get_current_user, get_username_by_id
+from src.services.auth_handler import get_current_user_websoket, get_current_user, get_username_by_id, WebSocketAuthError
 from src.models.role_model import PermissionLevel
 from src.security_middleware import AppealPermissionChecker
 from src.services.messanger_service import MessangerService, get_messager_service
@@ -11,7 +11,6 @@ from src.utils.log import log_action, log_action_ws, ActionType
 from fastapi import WebSocket, WebSocketDisconnect, Request, HTTPException, File, UploadFile
 from fastapi.responses import FileResponse
 from fastapi import APIRouter, Depends
-from http.cookies import SimpleCookie
 from typing import Dict, List
 from pathlib import Path
 import uuid, json
@@ -31,21 +30,10 @@ async def websocket_endpoint(
     await websocket.accept()
     
     try:
-        cookie_header = websocket.headers.get("cookie")
-        if not cookie_header:
-            await websocket.close(code=1008, reason="Токен не найден")
-            return
-            
-        cookies = SimpleCookie()
-        cookies.load(cookie_header)
-        token = cookies.get("access_token")
-        if not token:
-            await websocket.close(code=1008, reason="Токен не найден")
-            return
-
-        user = await get_current_user_websoket(token.value)
-        if not user:
-            await websocket.close(code=1008, reason="Пользователь не найден")
+        try:
+            user = await get_current_user_websoket(websocket)
+        except WebSocketAuthError as e:
+            await websocket.close(code=e.code, reason=e.reason)
             return
 
         try:
@@ -202,21 +190,10 @@ async def appeals_list_websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     
     try:
-        cookie_header = websocket.headers.get("cookie")
-        if not cookie_header:
-            await websocket.close(code=1008, reason="Токен не найден")
-            return
-            
-        cookies = SimpleCookie()
-        cookies.load(cookie_header)
-        token = cookies.get("access_token")
-        if not token:
-            await websocket.close(code=1008, reason="Токен не найден")
-            return
-
-        user = await get_current_user_websoket(token.value)
-        if not user:
-            await websocket.close(code=1008, reason="Пользователь не найден")
+        try:
+            user = await get_current_user_websoket(websocket)
+        except WebSocketAuthError as e:
+            await websocket.close(code=e.code, reason=e.reason)
             return
         
         await manager.connect_appeal_list(websocket)
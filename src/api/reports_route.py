@@ -1,19 +1,24 @@
-from datetime import datetime
+from datetime import datetime, date
 from pathlib import Path
-import json
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, Request
 from fastapi.templating import Jinja2Templates
 from typing import Dict, Optional, List
+import tempfile
 
 from src.models.appeal_model import AppealStatus, AppealType
 from src.security_middleware import RoleLevelChecker, PermissionLevel
 from src.services.auth_handler import get_current_user
 from src.services.reports_service import ReportService, get_report_service
+from src.services.complaint_service import ComplaintService, get_complaint_service
+from src.services.complaint_analytics_service import ComplaintAnalyticsService, get_complaint_analytics_service
 from src.schemas.user_stats_schema import UserStatsResponse, UserStatsUpdate
 from src.utils.log import log_action, ActionType
+from src.utils.file_cache import complaint_file_cache
+from src.utils.parser_jobs import JOB_KINDS, enqueue_parser_job, get_parser_job
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 COMPLAINT_DIR = PROJECT_ROOT / "storage/complaint"
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -38,6 +43,7 @@ async def get_complaints(
     admin: str = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str = Query(None),
     report_service: ReportService = Depends(get_report_service)
 ) -> Dict:
     """Получение жалоб с фильтрацией"""
@@ -46,7 +52,8 @@ async def get_complaints(
         date=date,
         admin=admin,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor
     )
 
 @router.get("/appeal-stats", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
@@ -60,6 +67,7 @@ async def get_appeal_stats(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     moderator: Optional[str] = None,
+    cursor: str = Query(None),
     report_service: ReportService = Depends(get_report_service)
 ) -> Dict:
     """Получение статистики по обращениям с фильтрацией"""
@@ -71,7 +79,8 @@ async def get_appeal_stats(
         date_to=date_to,
         page=page,
         per_page=per_page,
-        moderator=moderator
+        moderator=moderator,
+        cursor=cursor
     )
 
 @router.get("/delayed-complaints", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
@@ -80,13 +89,32 @@ async def get_delayed_complaints(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     admin: str = Query(None),
+    cursor: str = Query(None),
     report_service: ReportService = Depends(get_report_service)
 ) -> Dict:
     """Получение просроченных жалоб с поддержкой поиска"""
     return await report_service.get_delayed_complaints(
         page=page,
         per_page=per_page,
-        admin=admin
+        admin=admin,
+        cursor=cursor
+    )
+
+@router.get("/complaint-analytics", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
+async def get_complaint_analytics(
+    request: Request,
+    admin: str = Query(None),
+    status: str = Query(None),
+    date_from: date = Query(None),
+    date_to: date = Query(None),
+    analytics_service: ComplaintAnalyticsService = Depends(get_complaint_analytics_service)
+) -> Dict:
+    """Сводка по жалобам: сотрудники, статусы, серверы и распределение просрочек"""
+    return await analytics_service.get_analytics(
+        admin=admin,
+        status=status,
+        date_from=date_from,
+        date_to=date_to
     )
 
 @router.get("/user-stats", dependencies=[Depends(RoleLevelChecker(PermissionLevel.USER))])
@@ -187,12 +215,65 @@ async def update_reward_settings(
     
     return await report_service.update_reward_settings(settings_data)
 
+@router.get("/payout-snapshots", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
+async def get_payout_snapshots(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    report_service: ReportService = Depends(get_report_service)
+) -> List[Dict]:
+    """Версии расчета выплат"""
+    return await report_service.get_payout_snapshots(limit=limit)
+
+@router.get("/payout-snapshots/{version}", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
+async def get_payout_snapshot(
+    request: Request,
+    version: int,
+    report_service: ReportService = Depends(get_report_service)
+) -> Dict:
+    """Выплаты сотрудников в версии расчета"""
+    return await report_service.get_payout_snapshot(version)
+
+@router.post("/parser-jobs", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
+async def create_parser_job(request: Request, job_data: Dict) -> Dict:
+    """Постановка задачи в очередь воркера парсера (daily - за день, backfill - за период, resume - продолжение)"""
+    kind = job_data.get("kind", "daily")
+    if kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"Неизвестный тип задачи: {kind}")
+
+    params = {}
+    for field in ("date", "date_from", "date_to"):
+        if job_data.get(field):
+            try:
+                params[field] = date.fromisoformat(job_data[field]).isoformat()
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail=f"Некорректная дата в поле {field}, ожидается YYYY-MM-DD")
+    if kind == "backfill" and "date_from" not in params:
+        raise HTTPException(status_code=400, detail="Для загрузки за период нужна дата date_from")
+    if kind == "resume" and job_data.get("backfill_job_id"):
+        params["backfill_job_id"] = str(job_data["backfill_job_id"])
+
+    user = await get_current_user(request)
+    job_id = await enqueue_parser_job(kind, params, requested_by=user["username"] if user else None)
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/parser-jobs/{job_id}", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
+async def get_parser_job_status(request: Request, job_id: str) -> Dict:
+    """Статус задачи парсера и прогресс по форумам"""
+    job = await get_parser_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Задача парсера не найдена")
+    return job
+
+@router.get("/cache-stats", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
+async def get_cache_stats(request: Request) -> Dict:
+    """Статистика кэша файлов жалоб (попадания/промахи)"""
+    return complaint_file_cache.stats()
+
 @router.post("/upload-reports", dependencies=[Depends(RoleLevelChecker(PermissionLevel.MODERATOR_SUPERVISOR))])
 async def upload_reports(
     request: Request,
     reports_file: UploadFile,
-    file_content: str = Form(None),
-    report_service: ReportService = Depends(get_report_service)
+    complaint_service: ComplaintService = Depends(get_complaint_service)
 ):
     """Загрузка JSON файла с отчетами"""
     try:
@@ -201,34 +282,39 @@ async def upload_reports(
         if not reports_file.filename.lower().endswith('.json'):
             raise HTTPException(status_code=400, detail="Файл должен быть в формате JSON")
         
-        if file_content:
-            content = file_content
-        else:
-            content = await reports_file.read()
-            content = content.decode('utf-8')
-        
-        try:
-            reports_data = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise HTTPException(status_code=400, detail=f"Некорректный JSON формат: {str(e)}")
-        
-        if not isinstance(reports_data, list):
-            raise HTTPException(status_code=400, detail="Файл должен содержать массив отчетов")
-        
-        if reports_data:
-            first_report = reports_data[0]
-            required_fields = ['staff', 'status', 'startDate', 'endDate', 'reportDate', 'link', 'report_id']
-            
-            for field in required_fields:
-                if field not in first_report:
-                    raise HTTPException(status_code=400, detail=f"Отсутствует обязательное поле: {field}")
+        async def read_chunks():
+            while chunk := await reports_file.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
         
         current_date = datetime.now().strftime("%d%m%Y")
         filename = f"{current_date}_reports.json"
         file_path = COMPLAINT_DIR / filename
+        COMPLAINT_DIR.mkdir(parents=True, exist_ok=True)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(reports_data, f, indent=2, ensure_ascii=False)
+        # У каждой загрузки свой временный файл - параллельные загрузки за день не смешиваются
+        archive = tempfile.NamedTemporaryFile(dir=COMPLAINT_DIR, prefix=f"{filename}.", suffix=".part", delete=False)
+        tmp_path = Path(archive.name)
+        
+        try:
+            with archive:
+                result = await complaint_service.ingest_stream(read_chunks(), source="upload", archive=archive)
+        except ValueError as e:
+            tmp_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=400, detail=f"Некорректный JSON формат: {str(e)}")
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        if not result["accepted"] and result["rejected"]:
+            tmp_path.unlink(missing_ok=True)
+            first_error = result["errors"][0]
+            raise HTTPException(
+                status_code=400,
+                detail=f"Ни одна запись не прошла проверку. Запись {first_error['row']}: {first_error['error']}"
+            )
+        
+        tmp_path.replace(file_path)
+        complaint_file_cache.invalidate(file_path)
         
         await log_action(
             request=request,
@@ -237,7 +323,17 @@ async def upload_reports(
             user_id=user["id"]
         )
         
-        return {"message": "Отчеты успешно загружены", "filename": filename}
+        message = "Отчеты успешно загружены"
+        if result["rejected"]:
+            message = f"Загружено отчетов: {result['accepted']}, отклонено: {result['rejected']}"
+        
+        return {
+            "message": message,
+            "filename": filename,
+            "imported": result["accepted"],
+            "rejected": result["rejected"],
+            "errors": result["errors"]
+        }
         
     except HTTPException:
         raise
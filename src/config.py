@@ -12,6 +12,32 @@ class Config:
     
     REDIS_URL = "redis://redis:6379/0"
     REDIS_EXPIRE_SECONDS = 600
+    PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+    PRINCIPAL_LOCAL_TTL_SECONDS = float(os.getenv("PRINCIPAL_LOCAL_TTL_SECONDS", 5))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    LAST_LOGIN_FLUSH_SECONDS = float(os.getenv("LAST_LOGIN_FLUSH_SECONDS", 30))
+    ACTIVITY_CACHE_TTL_SECONDS = int(os.getenv("ACTIVITY_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+    
+    COMPLAINT_FILE_CACHE_MB = int(os.getenv("COMPLAINT_FILE_CACHE_MB", 64))
+    
+    FORUM_BASE_URL = os.getenv("FORUM_BASE_URL", "https://forum.majestic-rp.ru")
+    PARSER_CONCURRENCY_PER_HOST = int(os.getenv("PARSER_CONCURRENCY_PER_HOST", 4))
+    PARSER_REQUEST_TIMEOUT = float(os.getenv("PARSER_REQUEST_TIMEOUT", 30))
+    PARSER_RATE_PER_SECOND = float(os.getenv("PARSER_RATE_PER_SECOND", 1.0))
+    PARSER_BURST = int(os.getenv("PARSER_BURST", 3))
+    PARSER_JITTER_SECONDS = float(os.getenv("PARSER_JITTER_SECONDS", 0.5))
+    PARSER_MAX_RETRIES = int(os.getenv("PARSER_MAX_RETRIES", 4))
+    PARSER_MAX_BACKOFF_SECONDS = float(os.getenv("PARSER_MAX_BACKOFF_SECONDS", 60))
+    PARSER_FORUM_WORKERS = int(os.getenv("PARSER_FORUM_WORKERS", 4))
+    PARSER_EXTRACT_WORKERS = int(os.getenv("PARSER_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+    PARSER_EXTRACT_QUEUE_SIZE = int(os.getenv("PARSER_EXTRACT_QUEUE_SIZE", 64))
+    PARSER_PAGE_CACHE_DIR = os.getenv("PARSER_PAGE_CACHE_DIR")
+    PARSER_PAGE_CACHE_MB = int(os.getenv("PARSER_PAGE_CACHE_MB", 1024))
+    PARSER_PAGE_CACHE_MUTABLE_DAYS = float(os.getenv("PARSER_PAGE_CACHE_MUTABLE_DAYS", 1))
+    PARSER_STORE_BATCH_SIZE = int(os.getenv("PARSER_STORE_BATCH_SIZE", 50))
+    PARSER_ARCHIVE_JSON = os.getenv("PARSER_ARCHIVE_JSON", "false").lower() in ("1", "true", "yes")
+    PARSER_WORKER_ID = os.getenv("PARSER_WORKER_ID")
     
     EMAIL_TEMPLATES_DIR: str = "email-templates"
     EMAIL_VERIFICATION_EXPIRE_MINUTES = int(os.getenv("EMAIL_VERIFICATION_EXPIRE_MINUTES", 1440))
@@ -19,10 +19,20 @@ async_session = async_sessionmaker(
     autoflush=False
 )
 
+def create_missing_indexes(conn):
+    """
+    create_all не трогает уже существующие таблицы - индексы, объявленные
+    в моделях позже, создаются отдельно (CREATE INDEX IF NOT EXISTS)
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
 async def init_db():
     """Создает все таблицы в базе данных"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
 
 async def get_session():
     async with async_session() as session:
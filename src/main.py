@@ -1,3 +1,4 @@
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse, JSONResponse
@@ -18,7 +19,10 @@ from src.api.reports_route import router as report_router
 
 from src.database import init_db
 from src.scripts.init_roles import init_roles
-from src.scripts.parser_complaint import run_parser_background, run_parser_for_date
+from src.scripts.import_complaints import import_complaints
+from src.scripts.init_staff_stats import init_staff_stats
+from src.utils.principal_cache import principal_cache
+from src.utils.last_seen import last_seen
 
 class ProxyHeadersMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -72,7 +76,20 @@ def get_application() -> FastAPI:
     async def startup():
         await init_db()
         await init_roles()
-        pass
+        await init_staff_stats()
+        await import_complaints()
+        # Сбросы кэша пользователей из других процессов
+        application.state.principal_listener = asyncio.create_task(principal_cache.listen())
+        application.state.last_seen_flusher = asyncio.create_task(last_seen.run())
+
+    @application.on_event("shutdown")
+    async def shutdown():
+        application.state.principal_listener.cancel()
+        application.state.last_seen_flusher.cancel()
+        try:
+            await last_seen.flush()
+        except Exception as e:
+            print(f"Ошибка при записи last_login: {str(e)}")
         
     @application.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
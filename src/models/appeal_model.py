@@ -36,7 +36,8 @@ class Appeal(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now()
+        server_default=func.now(),
+        index=True
     )
     
     user = relationship("User", back_populates="appeals", lazy="joined")
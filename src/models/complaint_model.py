@@ -0,0 +1,94 @@
+from src.models.base_model import Base
+from sqlalchemy import String, Text, Integer, Float, Date, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from enum import Enum as PyEnum
+from datetime import datetime, date
+
+DELAY_THRESHOLD_HOURS = 24
+
+class ComplaintStatus(str, PyEnum):
+    RESOLVED = "Решено"
+    REJECTED = "Отклонено"
+
+class Complaint(Base):
+    __tablename__ = "complaints"
+    __table_args__ = (
+        Index("ix_complaints_status_delay", "status", "delay_hours", "report_id"),
+        Index("ix_complaints_start_report", "start_date", "report_id"),
+        Index("ix_complaints_staff_day", "staff", "start_day"),
+    )
+
+    report_id: Mapped[str] = mapped_column(
+        String(64),
+        unique=True,
+        nullable=False,
+        index=True
+    )
+    forum_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=True
+    )
+    staff: Mapped[str] = mapped_column(
+        String(100),
+        nullable=True,
+        index=True
+    )
+    status: Mapped[str] = mapped_column(
+        String(32),
+        nullable=True,
+        index=True
+    )
+    title: Mapped[str] = mapped_column(
+        Text,
+        nullable=True
+    )
+    link: Mapped[str] = mapped_column(
+        String(512),
+        nullable=True
+    )
+    report_date: Mapped[str] = mapped_column(
+        String(32),
+        nullable=True,
+        index=True
+    )
+    start_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True
+    )
+    start_day: Mapped[date] = mapped_column(
+        Date,
+        nullable=True,
+        index=True
+    )
+    end_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+    processing_hours: Mapped[float] = mapped_column(
+        Float,
+        nullable=True
+    )
+    delay_hours: Mapped[int] = mapped_column(
+        Integer,
+        nullable=True
+    )
+    source: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="upload"
+    )
+    payload: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
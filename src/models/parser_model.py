@@ -0,0 +1,113 @@
+from src.models.base_model import Base
+from sqlalchemy import String, Text, Integer, Date, DateTime, ForeignKey, UUID, Enum, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+from enum import Enum as PyEnum
+from datetime import date, datetime
+import uuid
+
+class BackfillStatus(str, PyEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class CrawlCheckpoint(Base):
+    """
+    Самая новая тема последнего полного обхода закрытого раздела форума.
+    Наличие точки значит, что раздел уже обходился целиком за дни
+    не позже thread_date, поэтому повторный обход останавливается
+    на странице листинга, все темы которой уже есть в complaints.
+    Темы попадают в раздел в порядке закрытия, а не ID, поэтому
+    thread_id не используется как граница обхода.
+    """
+    __tablename__ = "crawl_checkpoints"
+
+    closed_forum_id: Mapped[int] = mapped_column(
+        Integer,
+        unique=True,
+        nullable=False,
+        index=True
+    )
+    thread_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+    thread_started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+    # День темы по времени форума (для сравнения с целевым днем парсера)
+    thread_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+class BackfillJob(Base):
+    """Загрузка жалоб за период, прерванная задача продолжается с незавершенных форумов"""
+    __tablename__ = "backfill_jobs"
+
+    date_from: Mapped[date] = mapped_column(
+        Date,
+        nullable=False
+    )
+    date_to: Mapped[date] = mapped_column(
+        Date,
+        nullable=False
+    )
+    status: Mapped[BackfillStatus] = mapped_column(
+        Enum(BackfillStatus),
+        default=BackfillStatus.PENDING,
+        nullable=False,
+        index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+class BackfillTask(Base):
+    """Форум в составе задачи загрузки за период"""
+    __tablename__ = "backfill_tasks"
+    __table_args__ = (
+        UniqueConstraint("job_id", "forum_id", name="uq_backfill_task_job_forum"),
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("backfill_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    forum_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+    status: Mapped[BackfillStatus] = mapped_column(
+        Enum(BackfillStatus),
+        default=BackfillStatus.PENDING,
+        nullable=False
+    )
+    threads: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    error: Mapped[str] = mapped_column(
+        Text,
+        nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -0,0 +1,76 @@
+from src.models.base_model import Base
+from sqlalchemy import String, Integer, DateTime, ForeignKey, UniqueConstraint, UUID, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+import uuid
+
+class PayoutSnapshot(Base):
+    """
+    Версия расчета выплат: настройки вознаграждений, с которыми
+    пересчитаны суммы, и итог по всем сотрудникам на момент пересчета.
+    """
+    __tablename__ = "payout_snapshots"
+
+    version: Mapped[int] = mapped_column(
+        Integer,
+        unique=True,
+        nullable=False,
+        index=True
+    )
+    settings: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False
+    )
+    staff_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    recalculated: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    payout_total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+
+class StaffPayout(Base):
+    """Выплата сотрудника в рамках версии расчета"""
+    __tablename__ = "staff_payouts"
+    __table_args__ = (
+        UniqueConstraint("snapshot_id", "username", name="uq_staff_payout_snapshot_username"),
+    )
+
+    snapshot_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("payout_snapshots.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    username: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        index=True
+    )
+    fine: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    payment_status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
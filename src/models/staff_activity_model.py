@@ -0,0 +1,30 @@
+from src.models.base_model import Base
+from sqlalchemy import String, Integer, Date, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date
+
+class StaffDailyActivity(Base):
+    """Количество жалоб и обращений сотрудника за день (для графика активности)"""
+    __tablename__ = "staff_daily_activity"
+    __table_args__ = (
+        UniqueConstraint("username", "day", "source", name="uq_staff_daily_activity"),
+    )
+
+    username: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False
+    )
+    day: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        index=True
+    )
+    source: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
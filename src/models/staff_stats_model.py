@@ -0,0 +1,86 @@
+from src.models.base_model import Base
+from sqlalchemy import String, Integer, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+class StaffStats(Base):
+    """
+    Сводная статистика сотрудника для таблицы вознаграждений.
+    Счетчики обновляются при загрузке жалоб и изменении обращений,
+    fine/total/payment_status пересчитываются из счетчиков, настроек
+    вознаграждений и ручных правок (overrides).
+    """
+    __tablename__ = "staff_stats"
+
+    username: Mapped[str] = mapped_column(
+        String(100),
+        unique=True,
+        nullable=False,
+        index=True
+    )
+    complaints_total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    complaints_resolved: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    complaints_rejected: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    bans_issued: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    delays: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    appeals_total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    appeals_resolved: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    appeals_rejected: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    overrides: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=True
+    )
+    fine: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+    total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        index=True
+    )
+    payment_status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="Выплачено"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -0,0 +1,17 @@
+from src.database import get_session
+from src.services.complaint_service import ComplaintService
+
+async def import_complaints():
+    """Первичное заполнение хранилища жалоб из старых JSON файлов"""
+    async for db in get_session():
+        try:
+            complaint_service = ComplaintService(db)
+            if not await complaint_service.is_empty():
+                return
+
+            imported = await complaint_service.import_legacy_files()
+            if imported:
+                print(f"Импортировано жалоб из файлов: {imported}")
+        except Exception as e:
+            await db.rollback()
+            raise e
@@ -0,0 +1,24 @@
+from src.database import get_session
+from src.services.staff_stats_service import StaffStatsService
+from src.services.staff_activity_service import StaffActivityService
+
+async def init_staff_stats():
+    """Первичное построение сводной статистики и дневной активности сотрудников"""
+    async for db in get_session():
+        try:
+            staff_stats_service = StaffStatsService(db)
+            if await staff_stats_service.is_empty():
+                rebuilt = await staff_stats_service.rebuild()
+                if rebuilt:
+                    print(f"Построена сводная статистика сотрудников: {rebuilt}")
+
+            staff_activity_service = StaffActivityService(db)
+            if await staff_activity_service.is_empty():
+                rebuilt = await staff_activity_service.rebuild()
+                if rebuilt:
+                    print(f"Построена дневная активность сотрудников: {rebuilt}")
+
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
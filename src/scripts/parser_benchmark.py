@@ -0,0 +1,221 @@
+"""
+Офлайн-бенчмарк парсера жалоб на записанных страницах форума.
+
+Запись корпуса из дискового кэша страниц после обычного запуска парсера:
+    python -m src.scripts.parser_benchmark record benchmarks/corpus
+
+Прогон ForumParser через локальный сервер с записанными страницами:
+    python -m src.scripts.parser_benchmark run benchmarks/corpus 2026-10-01 2026-10-07 --output result.json
+    python -m src.scripts.parser_benchmark run benchmarks/corpus 2026-10-01 --compare result.json
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import date
+from aiohttp import web
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+from src.config import Config
+from src.utils.forum_client import ForumClient, MEMBER_MARKER
+from src.utils.forum_extract import extract_thread, shutdown_extract_pool
+from src.utils.page_cache import forum_page_cache
+from src.utils.rate_limiter import HostRateLimiter
+
+INDEX_FILENAME = "index.json"
+FRONT_PAGE = f'<html><body><div class="{MEMBER_MARKER}"></div></body></html>'
+
+def load_corpus(corpus_dir: Path) -> Dict:
+    with open(corpus_dir / INDEX_FILENAME, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def record_corpus(corpus_dir: Path, origin: str = Config.FORUM_BASE_URL) -> int:
+    """Копирует страницы форума из дискового кэша парсера в корпус"""
+    origin = origin.rstrip("/")
+    pages_dir = corpus_dir / "pages"
+    os.makedirs(pages_dir, exist_ok=True)
+
+    pages = {}
+    for meta_path in forum_page_cache.root.glob("*/*.json"):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                url = json.load(f)["url"]
+        except (OSError, ValueError, KeyError):
+            continue
+        if not url.startswith(origin):
+            continue
+
+        body = forum_page_cache.read_body(url)
+        if body is None:
+            continue
+        filename = f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html"
+        with open(pages_dir / filename, "w", encoding="utf-8") as f:
+            f.write(body)
+        pages[url[len(origin):] or "/"] = f"pages/{filename}"
+
+    with open(corpus_dir / INDEX_FILENAME, "w", encoding="utf-8") as f:
+        json.dump({"origin": origin, "pages": pages}, f, ensure_ascii=False, indent=2)
+    return len(pages)
+
+def build_app(corpus_dir: Path, corpus: Dict, base_url_holder: Dict) -> web.Application:
+    """Сервер записанных страниц; абсолютные ссылки на форум заменяются на адрес сервера"""
+    origin = corpus["origin"]
+
+    async def serve(request: web.Request) -> web.Response:
+        relative = corpus["pages"].get(request.path_qs) or corpus["pages"].get(request.path)
+        if relative is None:
+            if request.path == "/":
+                return web.Response(text=FRONT_PAGE, content_type="text/html")
+            return web.Response(status=404)
+        with open(corpus_dir / relative, "r", encoding="utf-8") as f:
+            body = f.read()
+        return web.Response(text=body.replace(origin, base_url_holder["url"]), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", serve)
+    return app
+
+def measure_thread_parse_cpu(corpus_dir: Path, corpus: Dict) -> List[float]:
+    """Процессорное время разбора каждой записанной темы (в текущем процессе)"""
+    timings = []
+    for path, relative in corpus["pages"].items():
+        if "/threads/" not in path:
+            continue
+        with open(corpus_dir / relative, "r", encoding="utf-8") as f:
+            page_html = f.read()
+        started = time.process_time()
+        extract_thread(page_html)
+        timings.append(time.process_time() - started)
+    return timings
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run_benchmark(corpus_dir: Path, date_from: date, date_to: date) -> Dict:
+    from src.scripts.parser_complaint import ForumParser, PLAYER_COMPLAINT_FORUMS
+
+    corpus = load_corpus(corpus_dir)
+    base_url_holder = {"url": ""}
+    runner = web.AppRunner(build_app(corpus_dir, corpus, base_url_holder))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url_holder["url"] = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    output_dir = Path(tempfile.mkdtemp(prefix="parser-benchmark-"))
+    # Без кэша страниц и без пауз вежливости: измеряется загрузка и разбор
+    client = ForumClient(
+        base_url=base_url_holder["url"],
+        cookies_file=corpus_dir / "cookies.json",
+        rate_limiter=HostRateLimiter(rate=1_000_000, burst=1_000_000, jitter=0),
+        page_cache=None
+    )
+    parser = ForumParser(
+        target_date=date_to,
+        date_from=date_from,
+        use_checkpoints=False,
+        client=client,
+        output_dir=output_dir,
+        store=False
+    )
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    threads = 0
+    try:
+        await parser.init_client()
+        for forum_id, forum_info in PLAYER_COMPLAINT_FORUMS.items():
+            threads += await parser.parse_forum(forum_id, forum_info) or 0
+    finally:
+        elapsed = time.perf_counter() - started
+        cpu_elapsed = time.process_time() - cpu_started
+        await parser.close()
+        await runner.cleanup()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    # Пул завершается до замера, чтобы RUSAGE_CHILDREN учитывал его процессы
+    shutdown_extract_pool()
+    timings = measure_thread_parse_cpu(corpus_dir, corpus)
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "revision": git_revision(),
+        "period": [date_from.isoformat(), date_to.isoformat()],
+        "corpus_pages": len(corpus["pages"]),
+        "pages": client.requests,
+        "threads": threads,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(client.requests / elapsed, 2) if elapsed else None,
+        "threads_per_sec": round(threads / elapsed, 2) if elapsed else None,
+        "main_process_cpu_seconds": round(cpu_elapsed, 3),
+        "thread_parse_cpu_ms": {
+            "count": len(timings),
+            "mean": round(statistics.mean(timings) * 1000, 3) if timings else None,
+            "p95": round(sorted(timings)[int(len(timings) * 0.95)] * 1000, 3) if timings else None
+        },
+        # ru_maxrss в Linux - килобайты
+        "peak_rss_mb": round(self_usage.ru_maxrss / 1024, 1),
+        "peak_rss_children_mb": round(children_usage.ru_maxrss / 1024, 1)
+    }
+
+def compare(result: Dict, baseline: Dict) -> Dict:
+    """Относительное изменение метрик к сохраненному прогону (в процентах)"""
+    metrics = ["pages_per_sec", "threads_per_sec", "seconds", "main_process_cpu_seconds", "peak_rss_mb"]
+    changes = {}
+    for metric in metrics:
+        old, new = baseline.get(metric), result.get(metric)
+        if old and new is not None:
+            changes[metric] = round((new - old) / old * 100, 1)
+    old_parse = (baseline.get("thread_parse_cpu_ms") or {}).get("mean")
+    new_parse = result["thread_parse_cpu_ms"]["mean"]
+    if old_parse and new_parse is not None:
+        changes["thread_parse_cpu_ms"] = round((new_parse - old_parse) / old_parse * 100, 1)
+    return {"baseline_revision": baseline.get("revision"), "change_percent": changes}
+
+def main():
+    from src.scripts.parser_complaint import parse_date_arg
+
+    arg_parser = argparse.ArgumentParser(description="Бенчмарк парсера жалоб на записанных страницах")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Запись корпуса из кэша страниц парсера")
+    record_parser.add_argument("corpus_dir", type=Path)
+
+    run_parser = commands.add_parser("run", help="Прогон парсера на корпусе")
+    run_parser.add_argument("corpus_dir", type=Path)
+    run_parser.add_argument("date_from", type=parse_date_arg)
+    run_parser.add_argument("date_to", type=parse_date_arg, nargs="?")
+    run_parser.add_argument("--output", type=Path, help="Куда сохранить результат (JSON)")
+    run_parser.add_argument("--compare", type=Path, help="Результат предыдущего прогона для сравнения")
+
+    args = arg_parser.parse_args()
+    if args.command == "record":
+        print(f"Записано страниц: {record_corpus(args.corpus_dir)}")
+        return
+
+    try:
+        result = asyncio.run(run_benchmark(args.corpus_dir, args.date_from, args.date_to or args.date_from))
+    finally:
+        shutdown_extract_pool()
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
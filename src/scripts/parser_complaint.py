@@ -1,337 +1,633 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta, date
 import os
 import json
-import time
-import random
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from urllib.parse import urljoin
+import argparse
 import asyncio
+import re
+import time
+import uuid
 from pathlib import Path
+from typing import Awaitable, Callable
+
+from src.config import Config
+from src.database import async_session, init_db
+from src.models.parser_model import BackfillStatus
+from src.services.crawl_checkpoint_service import CrawlCheckpointService
+from src.services.backfill_service import BackfillService
+from src.services.complaint_service import ComplaintService
+from src.utils.complaint_forums import PLAYER_COMPLAINT_FORUMS
+from src.utils.forum_client import ForumClient, USER_AGENT, COOKIES_FILE
+from src.utils.forum_extract import extract_listing, extract_thread, get_extract_pool, shutdown_extract_pool
 
-BASE_URL = "https://forum.majestic-rp.ru"
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-COOKIES_FILE = "majestic_cookies.json"
-
-# Основные форумы жалоб и их закрытые разделы (с указанием статуса)
-PLAYER_COMPLAINT_FORUMS = {
-    37: {"name": "New York", "closed": {112: "Решено", 172: "Отклонено"}},
-    169: {"name": "Detroit", "closed": {173: "Решено", 174: "Отклонено"}},
-    247: {"name": "Chicago", "closed": {249: "Решено", 250: "Отклонено"}},
-    318: {"name": "San Francisco", "closed": {323: "Решено", 324: "Отклонено"}},
-    474: {"name": "Atlanta", "closed": {475: "Решено", 506: "Отклонено"}},
-    540: {"name": "San Diego", "closed": {543: "Решено", 544: "Отклонено"}},
-    652: {"name": "Los Angeles", "closed": {653: "Решено", 654: "Отклонено"}},
-    762: {"name": "Miami", "closed": {763: "Решено", 764: "Отклонено"}},
-    859: {"name": "Las Vegas", "closed": {862: "Решено", 863: "Отклонено"}},
-    936: {"name": "Washington", "closed": {937: "Решено", 938: "Отклонено"}},
-    994: {"name": "Dallas", "closed": {995: "Решено", 996: "Отклонено"}},
-    1059: {"name": "Boston", "closed": {1060: "Решено", 1061: "Отклонено"}},
-    1148: {"name": "Seattle", "closed": {1149: "Решено", 1150: "Отклонено"}},
-    1253: {"name": "Phoenix", "closed": {1254: "Решено", 1255: "Отклонено"}}
-}
+BASE_URL = Config.FORUM_BASE_URL
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 COMPLAINT_DIR = PROJECT_ROOT / "storage/complaint"
 
+THREAD_ID_PATTERN = re.compile(r"\.(\d+)/?(?:unread)?/?$")
+
+def thread_id_from_url(url: str):
+    """Числовой ID темы из адреса вида /threads/<slug>.<id>/"""
+    match = THREAD_ID_PATTERN.search(url)
+    return int(match.group(1)) if match else None
+
+def load_forum_complaints(filepath) -> list:
+    """Жалобы из ранее записанного файла форума (пустой список, если файла нет)"""
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("complaints", []) if isinstance(data, dict) else []
+    except (OSError, ValueError):
+        return []
+
 class ForumParser:
-    def __init__(self, target_date: date = None):
-        self.driver = None
+    """
+    Парсер закрытых жалоб за период [date_from, target_date]
+    (по умолчанию - только за target_date). Листинг каждого раздела
+    обходится один раз, разобранные темы сразу пишутся в хранилище жалоб.
+    JSON-файлы форумов по дням создания тем пишутся только для архива.
+    """
+    def __init__(
+        self,
+        target_date: date = None,
+        base_url: str = BASE_URL,
+        use_checkpoints: bool = True,
+        date_from: date = None,
+        client: ForumClient = None,
+        output_dir: Path = COMPLAINT_DIR,
+        progress: Callable[[int, dict], Awaitable[None]] = None,
+        store: bool = True,
+        archive: bool = Config.PARSER_ARCHIVE_JSON
+    ):
+        self.client = client or ForumClient(base_url=base_url)
+        self.output_dir = Path(output_dir)
+        # Получатель прогресса по форумам (например, статус задачи в Redis)
+        self.progress = progress
         self.target_date = target_date or datetime.now().date()
-        
-        self.data_dir = COMPLAINT_DIR / str(self.target_date)
-        os.makedirs(self.data_dir, exist_ok=True)
+        self.date_from = date_from or self.target_date
+        self.use_checkpoints = use_checkpoints
+        self.store = store
+        self.archive = archive
+        # Разделы, обойденные не полностью или с ошибками разбора тем
+        self.incomplete_sections = set()
 
-    def is_target_date(self, date_str):
-        """Проверяет, соответствует ли дата целевому дню"""
-        try:
-            date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00")).date()
-            return date_obj == self.target_date
-        except Exception as e:
-            print(f"Ошибка при проверке даты {date_str}: {e}")
-            return False
+    @property
+    def period(self) -> str:
+        if self.date_from == self.target_date:
+            return str(self.target_date)
+        return f"{self.date_from} - {self.target_date}"
+
+    def days(self):
+        return [self.date_from + timedelta(days=i) for i in range((self.target_date - self.date_from).days + 1)]
 
-    async def init_driver(self):
-        """Инициализация драйвера Selenium"""
-        if self.driver is not None:
+    def day_dir(self, day: date) -> Path:
+        data_dir = self.output_dir / str(day)
+        os.makedirs(data_dir, exist_ok=True)
+        return data_dir
+
+    async def init_client(self):
+        """Открывает HTTP-сессию с сохраненными куки, при необходимости - вход через браузер"""
+        if self.client.session is not None:
             return
-            
-        options = Options()
-        options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument(f"user-agent={USER_AGENT}")
-        
-        self.driver = webdriver.Chrome(options=options)
-        
-        # Загружаем куки если они есть
-        if os.path.exists(COOKIES_FILE):
-            with open(COOKIES_FILE, "r") as f:
-                cookies = json.load(f)
-                self.driver.get(BASE_URL)
-                for cookie in cookies:
-                    if 'sameSite' in cookie:
-                        del cookie['sameSite']
-                    self.driver.add_cookie(cookie)
-        
-        # Проверяем авторизацию
-        self.driver.get(BASE_URL)
-        try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.p-navgroup--member"))
-            )
-        except:
-            print("Не удалось загрузить главную страницу, возможно требуется авторизация")
-            await self.login_manually()
 
-    async def login_manually(self):
-        """Ручная авторизация если куки невалидны"""
+        await self.client.open()
+        if await self.client.is_authorized():
+            return
+
+        print("Не удалось загрузить главную страницу, возможно требуется авторизация")
+        await asyncio.to_thread(self.login_manually)
+        self.client.load_cookies()
+
+    def login_manually(self):
+        """Ручная авторизация в браузере, если куки невалидны; куки сохраняются для HTTP-клиента"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         print("Пожалуйста, авторизуйтесь вручную в открывшемся браузере...")
-        self.driver.quit()
-        
         options = Options()
         options.add_argument(f"user-agent={USER_AGENT}")
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.get(BASE_URL)
-        
-        input("После успешной авторизации нажмите Enter для продолжения...")
-        
-        # Сохраняем куки
-        cookies = self.driver.get_cookies()
-        with open(COOKIES_FILE, "w") as f:
-            json.dump(cookies, f)
+        driver = webdriver.Chrome(options=options)
+        try:
+            driver.get(self.client.base_url)
+            
+            input("После успешной авторизации нажмите Enter для продолжения...")
+            
+            # Сохраняем куки
+            cookies = driver.get_cookies()
+            with open(COOKIES_FILE, "w") as f:
+                json.dump(cookies, f)
+        finally:
+            driver.quit()
             
         print("Куки успешно сохранены")
 
+    async def close(self):
+        await self.client.close()
+
+    async def prune_page_cache(self):
+        """Ограничение дискового кэша страниц после завершения обхода"""
+        if not self.client.page_cache:
+            return
+        try:
+            result = await asyncio.to_thread(self.client.page_cache.prune)
+            print(f"Кэш страниц: удалено записей {result['removed']}, размер {result['size_bytes'] // (1024 * 1024)} МБ")
+        except Exception as e:
+            print(f"Ошибка при очистке кэша страниц: {e}")
+
+    async def report_progress(self, forum_id: int, **progress):
+        if self.progress is None:
+            return
+        try:
+            await self.progress(forum_id, progress)
+        except Exception as e:
+            print(f"Ошибка при передаче прогресса форума {forum_id}: {e}")
+
     async def parse_forum(self, forum_id: int, forum_info: dict):
-        """Парсинг конкретного форума только за целевой день"""
-        await self.init_driver()
+        """
+        Парсинг конкретного форума за целевой период, возвращает число
+        записанных тем. В режиме архива файл форума пишется за каждый день.
+        """
+        await self.init_client()
         
         try:
-            closed_threads = await self.get_all_closed_threads(forum_id, forum_info["closed"])
-            
-            data = {
-                "forum_id": forum_id,
-                "forum_name": forum_info["name"],
-                "complaints": closed_threads,
-                "last_updated": datetime.now().isoformat(),
-                "target_date": self.target_date.isoformat()
-            }
-            
-            filename = f"forum-{forum_id}.json"
-            filepath = os.path.join(self.data_dir, filename)
-            
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            return data
+            archived = [] if self.archive else None
+            threads = await self.get_all_closed_threads(forum_id, forum_info["closed"], archived)
+
+            if archived is not None:
+                by_day = {day: [] for day in self.days()}
+                for complaint in archived:
+                    day = datetime.fromisoformat(complaint["startDate"]).date()
+                    by_day.setdefault(day, []).append(complaint)
+                for day, complaints in by_day.items():
+                    self.write_forum_file(day, forum_id, forum_info, complaints)
+
+            return threads
         except Exception as e:
             print(f"Критическая ошибка при парсинге форума {forum_id}: {e}")
             return None
 
-    async def get_all_closed_threads(self, forum_id: int, closed_forums: dict):
-        """Получение всех закрытых тем за целевой день с указанием статуса"""
-        threads = []
+    def write_forum_file(self, day: date, forum_id: int, forum_info: dict, closed_threads: list):
+        data_dir = self.day_dir(day)
+        filename = f"forum-{forum_id}.json"
+        filepath = os.path.join(data_dir, filename)
+
+        # Темы до контрольной точки не загружаются повторно - они берутся
+        # из предыдущего файла за этот день
+        complaints = {complaint.get("link"): complaint for complaint in load_forum_complaints(filepath)}
+        complaints.update((complaint.get("link"), complaint) for complaint in closed_threads)
         
-        for closed_forum_id, status in closed_forums.items():
-            base_url = f"{BASE_URL}/forums/rassmotrennyye-zhaloby.{closed_forum_id}/"
-            page = 1
-            closed_urls = []
-            stop_parsing = False
+        data = {
+            "forum_id": forum_id,
+            "forum_name": forum_info["name"],
+            "complaints": list(complaints.values()),
+            "last_updated": datetime.now().isoformat(),
+            "target_date": day.isoformat()
+        }
+        
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        
+        return data
+
+    async def get_all_closed_threads(self, forum_id: int, closed_forums: dict, archived: list = None):
+        """Загрузка всех закрытых тем форума за целевой период, возвращает число записанных тем"""
+        checkpoints = await self.load_checkpoints(closed_forums.keys())
+        sections = await asyncio.gather(*(
+            self.get_closed_section_threads(forum_id, closed_forum_id, status, closed_forum_id in checkpoints, archived)
+            for closed_forum_id, status in closed_forums.items()
+        ))
+        return sum(sections)
+
+    async def load_checkpoints(self, closed_forum_ids):
+        """
+        Разделы, которые уже обходились целиком. Контрольная точка применима,
+        только если она не новее начала периода: более ранние дни прошлый
+        обход мог не захватить
+        """
+        if not self.use_checkpoints:
+            return {}
+        async with async_session() as session:
+            checkpoints = await CrawlCheckpointService(session).get_checkpoints(closed_forum_ids)
+        return {
+            closed_forum_id: thread_id
+            for closed_forum_id, (thread_id, thread_date) in checkpoints.items()
+            if thread_date <= self.date_from
+        }
+
+    async def stored_report_ids(self, thread_ids) -> set:
+        """ID тем (report_id), которые уже есть в хранилище жалоб"""
+        report_ids = [str(thread_id) for thread_id in thread_ids if thread_id is not None]
+        async with async_session() as session:
+            return await ComplaintService(session).existing_report_ids(report_ids)
+
+    async def save_checkpoint(self, closed_forum_id: int, closed_urls: list):
+        newest = max(
+            ((thread_id_from_url(url), created_at) for url, created_at, _ in closed_urls),
+            key=lambda item: item[0] or 0
+        )
+        if not newest[0]:
+            return
+        async with async_session() as session:
+            await CrawlCheckpointService(session).advance(
+                closed_forum_id,
+                newest[0],
+                datetime.fromisoformat(newest[1])
+            )
+            await session.commit()
+
+    async def get_closed_section_threads(
+        self,
+        forum_id: int,
+        closed_forum_id: int,
+        status: str,
+        incremental: bool = False,
+        archived: list = None
+    ):
+        """Закрытые темы одного раздела: листинг обходится по страницам, темы загружаются параллельно"""
+        try:
+            closed_urls, complete = await self.get_closed_thread_urls(closed_forum_id, status, incremental)
+        except Exception as e:
+            print(f"Ошибка при парсинге закрытых тем форума {closed_forum_id}: {e}")
+            self.incomplete_sections.add(closed_forum_id)
+            return 0
+
+        print(f"Найдено {len(closed_urls)} новых закрытых тем за {self.period} для анализа из форума {closed_forum_id}")
+
+        stored = await self.parse_closed_threads(forum_id, closed_urls, archived)
+        if not complete or stored != len(closed_urls):
+            self.incomplete_sections.add(closed_forum_id)
 
+        # Точка сдвигается, только если листинг пройден и все темы разобраны и записаны
+        if self.use_checkpoints and complete and closed_urls and stored == len(closed_urls):
             try:
-                while not stop_parsing:
-                    url = f"{base_url}page-{page}" if page > 1 else base_url
-                    print(f"Загружаем страницу закрытых тем: {url}")
-                    
-                    self.driver.get(url)
-                    try:
-                        WebDriverWait(self.driver, 20).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.structItemContainer"))
-                        )
-                    except Exception as e:
-                        print(f"Не удалось загрузить страницу {url}: {e}")
-                        break
+                await self.save_checkpoint(closed_forum_id, closed_urls)
+            except Exception as e:
+                print(f"Ошибка при сохранении контрольной точки раздела {closed_forum_id}: {e}")
+        return stored
+
+    async def get_closed_thread_urls(self, closed_forum_id: int, status: str, incremental: bool = False):
+        """
+        Ссылки на закрытые темы раздела за целевой период и признак полного обхода.
+        В инкрементальном режиме темы, уже записанные в complaints, пропускаются,
+        а обход прекращается на странице, все темы которой уже записаны: темы
+        попадают в раздел в порядке закрытия, дальше идут закрытые раньше.
+        """
+        base_url = f"/forums/rassmotrennyye-zhaloby.{closed_forum_id}/"
+        page = 1
+        closed_urls = []
+        complete = True
+
+        while True:
+            url = f"{base_url}page-{page}" if page > 1 else base_url
+            print(f"Загружаем страницу закрытых тем: {url}")
+            
+            try:
+                html = await self.client.fetch(url)
+            except Exception as e:
+                print(f"Не удалось загрузить страницу {url}: {e}")
+                complete = False
+                break
+            
+            listing = await self.extract(extract_listing, html)
+            
+            if not listing["blocks"]:
+                print(f"Страница {page} закрытых тем пуста (forum_id: {closed_forum_id})")
+                break
+
+            stop_parsing = False
+            page_threads = []
+            for thread in listing["threads"]:
+                try:
+                    date_str = thread["datetime"]
+                    thread_date = datetime.fromisoformat(date_str).date()
                     
-                    soup = BeautifulSoup(self.driver.page_source, "lxml")
-                    thread_blocks = soup.select("div.structItem--thread")
+                    # Если тема старше начала периода - прекращаем парсинг
+                    if thread_date < self.date_from:
+                        if page > 1:  # Если это не первая страница
+                            stop_parsing = True
+                            break
+                        continue  # На первой странице просто пропускаем
                     
-                    if not thread_blocks:
-                        print(f"Страница {page} закрытых тем пуста (forum_id: {closed_forum_id})")
-                        break
-
-                    page_has_target_date = False
-                    for thread in thread_blocks:
-                        try:
-                            title_tag = thread.select_one("a[data-tp-primary='on']")
-                            date_tag = thread.select_one("li.structItem-startDate time.u-dt")
-                            
-                            if not title_tag or not date_tag:
-                                continue
-                                
-                            date_str = date_tag["datetime"].replace("+0300", "+03:00")
-                            thread_date = datetime.fromisoformat(date_str).date()
-                            
-                            # Если тема старше целевой даты - прекращаем парсинг
-                            if thread_date < self.target_date:
-                                if page > 1:  # Если это не первая страница
-                                    stop_parsing = True
-                                    break
-                                continue  # На первой странице просто пропускаем
-                            
-                            # Если тема новее целевой даты - продолжаем искать
-                            if thread_date > self.target_date:
-                                continue
-                                
-                            thread_url = urljoin(BASE_URL, title_tag["href"])
-                            closed_urls.append((thread_url, date_str, status))
-                            page_has_target_date = True
-                        except Exception as e:
-                            print(f"Ошибка при обработке закрытой темы: {e}")
-                            continue
-
-                    if stop_parsing:
-                        break
-
-                    print(f"Страница {page}: найдено {len(thread_blocks)} тем")
-
-                    # Если на странице не было тем за целевой день и это не первая страница - выходим
-                    if not page_has_target_date and page > 1:
-                        break
-
-                    # Проверяем наличие следующей страницы
-                    next_page = soup.select_one('a.pageNav-jump--next')
-                    if not next_page:
-                        break
-
-                    page += 1
-                    time.sleep(random.uniform(1, 3))
+                    # Если тема новее конца периода - продолжаем искать
+                    if thread_date > self.target_date:
+                        continue
+                        
+                    thread_url = urljoin(self.client.base_url, thread["href"])
+                    page_threads.append((thread_url, date_str, status))
+                except Exception as e:
+                    print(f"Ошибка при обработке закрытой темы: {e}")
+                    continue
 
-            except Exception as e:
-                print(f"Ошибка при парсинге закрытых тем форума {closed_forum_id}: {e}")
-                continue
+            if incremental and page_threads:
+                stored = await self.stored_report_ids(thread_id_from_url(thread_url) for thread_url, _, _ in page_threads)
+                new_threads = [item for item in page_threads if str(thread_id_from_url(item[0])) not in stored]
+                # Дальше идут уже загруженные темы (на первой странице могут быть закрепленные)
+                if not new_threads and page > 1:
+                    stop_parsing = True
+                page_threads = new_threads
+
+            closed_urls.extend(page_threads)
+            page_has_target_date = bool(page_threads)
+
+            if stop_parsing:
+                break
+
+            print(f"Страница {page}: найдено {listing['blocks']} тем")
+
+            # Если на странице не было тем за целевой период и это не первая страница - выходим
+            if not page_has_target_date and page > 1:
+                break
+
+            # Проверяем наличие следующей страницы
+            if not listing["has_next"]:
+                break
 
-            print(f"Найдено {len(closed_urls)} закрытых тем за {self.target_date} для анализа из форума {closed_forum_id}")
+            page += 1
 
-            # Парсим каждую закрытую тему
-            for i, (url, created_at, status) in enumerate(closed_urls, 1):
+        return closed_urls, complete
+
+    async def extract(self, func, *args):
+        """Разбор HTML в пуле процессов, цикл событий продолжает загрузку страниц"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_extract_pool(), func, *args)
+
+    async def store_complaints(self, complaints: list):
+        """Запись пачки жалоб в хранилище (повторные темы обновляются по report_id)"""
+        if not self.store:
+            return
+        async with async_session() as session:
+            await ComplaintService(session).upsert_complaints(complaints, source="parser")
+
+    async def parse_closed_threads(self, forum_id: int, closed_urls: list, archived: list = None):
+        """
+        Загрузка и разбор тем раздела: загрузчики кладут HTML в ограниченную
+        очередь, обработчики отдают его в пул процессов, разобранные жалобы
+        пишутся в хранилище пачками. Одновременность загрузки ограничивается
+        пулом соединений клиента. Возвращает число записанных тем.
+        """
+        queue = asyncio.Queue(maxsize=Config.PARSER_EXTRACT_QUEUE_SIZE)
+        pending = []
+        store_lock = asyncio.Lock()
+        stored = 0
+
+        async def flush():
+            nonlocal stored
+            async with store_lock:
+                if not pending:
+                    return
+                batch = pending[:]
+                pending.clear()
                 try:
-                    closed_data = await self.parse_closed_thread(url, forum_id, status)
-                    if closed_data:
-                        closed_data["startDate"] = created_at
-                        threads.append(closed_data)
-                    print(f"Обработано {i}/{len(closed_urls)} закрытых тем", end="\r")
+                    await self.store_complaints(batch)
+                    stored += len(batch)
                 except Exception as e:
-                    print(f"Ошибка при парсинге темы {url}: {e}")
-                    continue
+                    print(f"Ошибка при записи {len(batch)} жалоб форума {forum_id} в хранилище: {e}")
+
+        async def fetch(url, created_at, status):
+            clean_url = url.replace("/unread", "")
+            try:
+                html = await self.client.fetch(clean_url)
+            except Exception as e:
+                print(f"Ошибка при загрузке темы {clean_url}: {e}")
+                return
+            await queue.put((clean_url, created_at, status, html))
 
-        return threads
+        async def process():
+            while True:
+                clean_url, created_at, status, html = await queue.get()
+                try:
+                    closed_data = await self.extract(extract_thread, html)
+                    if closed_data is None:
+                        print(f"Ошибка при парсинге закрытой темы {clean_url}: на странице нет сообщений")
+                    else:
+                        complaint = self.build_complaint(forum_id, clean_url, created_at, status, closed_data)
+                        # Закрытая тема не меняется - повторные запуски берут ее из кэша
+                        self.client.mark_immutable(clean_url)
+                        pending.append(complaint)
+                        if archived is not None:
+                            archived.append(complaint)
+                        if len(pending) >= Config.PARSER_STORE_BATCH_SIZE:
+                            await flush()
+                except Exception as e:
+                    print(f"Ошибка при парсинге закрытой темы {clean_url}: {e}")
+                finally:
+                    queue.task_done()
 
-    async def parse_closed_thread(self, url: str, forum_id: int, status: str):
-        """Парсинг отдельной закрытой темы"""
+        workers = [asyncio.create_task(process()) for _ in range(Config.PARSER_EXTRACT_WORKERS)]
         try:
-            clean_url = url.replace("/unread", "")
-            print(f"Парсим закрытую тему: {clean_url}")
-            self.driver.get(clean_url)
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "article.message"))
-            )
-            
-            soup = BeautifulSoup(self.driver.page_source, "lxml")
-            
-            title_tag = soup.select_one("h1.p-title-value")
-            author_tag = soup.select_one("a.username")
-            
-            admin_posts = [p for p in soup.select("article.message") if p.select_one("span.username--style3, span.username--style9, span.username--style6, username--style40")]
-            end_date = admin = None
+            await asyncio.gather(*(fetch(*item) for item in closed_urls))
+            await queue.join()
+            await flush()
+        finally:
+            for worker in workers:
+                worker.cancel()
+        return stored
 
-            if admin_posts:
-                closed_tag = admin_posts[-1].select_one("time.u-dt")
-                end_date = datetime.fromisoformat(closed_tag['datetime'].replace("+0000", "+00:00")) if closed_tag else None
+    def build_complaint(self, forum_id: int, clean_url: str, created_at: str, status: str, closed_data: dict):
+        # Получаем ID жалобы из URL
+        report_id = clean_url.split(".")[-1].split("/")[0] if "." in clean_url else None
+        return {
+            "forum_id": forum_id,
+            "title": closed_data["title"],
+            "author": closed_data["author"],
+            "admin": closed_data["admin"],
+            "status": status,
+            "startDate": created_at,
+            "endDate": closed_data["endDate"],
+            "reportDate": datetime.fromisoformat(created_at).date().isoformat() if created_at else None,
+            "link": clean_url,
+            "report_id": report_id,
+            "durationFormatted": closed_data["durationFormatted"]
+        }
 
-                admin_tag = admin_posts[-1].select_one("span.username--style3, span.username--style9, span.username--style6")
-                admin = admin_tag.text.strip() if admin_tag else None
+    def spawn(self) -> "ForumParser":
+        """Парсер того же периода со своим HTTP-клиентом (для отдельного форума)"""
+        return ForumParser(
+            target_date=self.target_date,
+            use_checkpoints=self.use_checkpoints,
+            date_from=self.date_from,
+            client=self.client.clone(),
+            output_dir=self.output_dir,
+            progress=self.progress,
+            store=self.store,
+            archive=self.archive
+        )
 
-            # Получаем ID жалобы из URL
-            report_id = clean_url.split(".")[-1].split("/")[0] if "." in clean_url else None
-            
-            # Вычисляем длительность
-            duration_str = ""
-            if end_date:
-                start_date = datetime.fromisoformat(soup.select_one("time.u-dt")['datetime'].replace("+0000", "+00:00"))
-                duration = end_date - start_date
-                days = duration.days
-                hours, remainder = divmod(duration.seconds, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                duration_str = f"{days}d {hours}h {minutes}m {seconds}s"
-
-            return {
-                "forum_id": forum_id,
-                "title": title_tag.text.strip() if title_tag else None,
-                "author": author_tag.text.strip() if author_tag else None,
-                "admin": admin,
-                "status": status,
-                "startDate": None,
-                "endDate": end_date.isoformat() if end_date else None,
-                "link": clean_url,
-                "report_id": report_id,
-                "durationFormatted": duration_str
-            }
+    async def run_forum(self, forum_id: int, forum_info: dict) -> dict:
+        """
+        Парсинг одного форума в отдельной сессии: ошибка форума не прерывает
+        остальные и попадает в его строку сводки
+        """
+        print(f"\nПарсинг форума {forum_info['name']} (ID: {forum_id})...")
+        await self.report_progress(forum_id, status="running")
+        started = time.monotonic()
+
+        parser = self.spawn()
+        threads = error = None
+        try:
+            await parser.client.open()
+            threads = await parser.parse_forum(forum_id, forum_info)
         except Exception as e:
-            print(f"Ошибка при парсинге закрытой темы {url}: {e}")
-            return None
+            error = str(e)
+            print(f"Ошибка при парсинге форума {forum_id}: {e}")
+        finally:
+            await parser.close()
+
+        self.incomplete_sections |= parser.incomplete_sections
+        result = {
+            "name": forum_info["name"],
+            "status": "done" if threads is not None else "failed",
+            "threads": threads or 0,
+            "seconds": round(time.monotonic() - started, 1),
+            "incomplete_sections": sorted(set(forum_info["closed"]) & parser.incomplete_sections)
+        }
+        if error:
+            result["error"] = error
+        await self.report_progress(forum_id, **result)
+        return result
 
     async def run_daily_parse(self):
-        """Парсинг всех форумов за целевой день"""
+        """
+        Парсинг всех форумов за целевой период ограниченным пулом воркеров
+        (PARSER_FORUM_WORKERS). У каждого форума своя сессия, общий бюджет
+        запросов к форуму задает ограничитель частоты клиента.
+        Возвращает сводку запуска с длительностью и числом тем по форумам.
+        """
+        started = time.monotonic()
+        forums = {}
         try:
-            await self.init_driver()
-            
-            all_data = {}
-            for forum_id, forum_info in PLAYER_COMPLAINT_FORUMS.items():
-                print(f"\nПарсинг форума {forum_info['name']} (ID: {forum_id})...")
-                forum_data = await self.parse_forum(forum_id, forum_info)
-                if forum_data:
-                    all_data[forum_id] = forum_data
-                time.sleep(random.uniform(2, 5))
-            
-            return all_data
+            # Авторизация проверяется один раз, сессии форумов берут сохраненные куки
+            await self.init_client()
+
+            queue = asyncio.Queue()
+            for item in PLAYER_COMPLAINT_FORUMS.items():
+                queue.put_nowait(item)
+
+            async def worker():
+                while not queue.empty():
+                    forum_id, forum_info = queue.get_nowait()
+                    forums[forum_id] = await self.run_forum(forum_id, forum_info)
+
+            workers = max(1, min(Config.PARSER_FORUM_WORKERS, len(PLAYER_COMPLAINT_FORUMS)))
+            await asyncio.gather(*(worker() for _ in range(workers)))
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
+            await self.close()
+        await self.prune_page_cache()
+
+        summary = {
+            "period": self.period,
+            "seconds": round(time.monotonic() - started, 1),
+            "threads": sum(forum["threads"] for forum in forums.values()),
+            "failed": [forum_id for forum_id, forum in forums.items() if forum["status"] == "failed"],
+            "forums": {forum_id: forums[forum_id] for forum_id in PLAYER_COMPLAINT_FORUMS if forum_id in forums}
+        }
+        print(f"\nПарсинг за {summary['period']} завершен за {summary['seconds']} с, тем: {summary['threads']}")
+        for forum_id, forum in summary["forums"].items():
+            print(f"  {forum['name']} ({forum_id}): {forum['status']}, тем {forum['threads']}, {forum['seconds']} с")
+        return summary
+
+async def run_backfill(date_from: date = None, date_to: date = None, job_id=None, progress=None):
+    """
+    Загрузка жалоб за период: листинг каждого раздела обходится один раз,
+    прогресс по форумам пишется в backfill_tasks. Без дат продолжается
+    указанная (или последняя незавершенная) задача с незагруженных форумов.
+    """
+    async with async_session() as session:
+        backfill_service = BackfillService(session)
+        if date_from is not None:
+            job = await backfill_service.create_job(date_from, date_to or date_from, PLAYER_COMPLAINT_FORUMS.keys())
+        elif job_id is not None:
+            job = await backfill_service.get_job(job_id)
+        else:
+            job = await backfill_service.get_unfinished_job()
+        if job is None:
+            print("Нет задач загрузки для продолжения")
+            return None
 
-async def scheduled_parser(target_date: date = None):
-    """Запланированный парсер для конкретной даты"""
-    parser = ForumParser(target_date=target_date)
+        await backfill_service.set_job_status(job.id, BackfillStatus.RUNNING)
+        pending = await backfill_service.get_pending_forums(job.id)
+        progress_before = await backfill_service.get_progress(job.id) if date_from is None else {}
+        await session.commit()
+
+    print(f"Загрузка за {job.date_from} - {job.date_to} (задача {job.id}), осталось форумов: {len(pending)}")
+    for forum_id, task in sorted(progress_before.items()):
+        error = f", {task['error']}" if task["error"] else ""
+        print(f"  {forum_id}: {task['status']}, тем {task['threads']}{error}")
+
+    async def set_job_status(job_id, status):
+        async with async_session() as session:
+            await BackfillService(session).set_job_status(job_id, status)
+            await session.commit()
+
+    async def set_task_status(forum_id, status, threads=0, error=None):
+        async with async_session() as session:
+            await BackfillService(session).set_task_status(job.id, forum_id, status, threads, error)
+            await session.commit()
+        await parser.report_progress(forum_id, status=status.value, threads=threads, error=error)
+
+    parser = ForumParser(target_date=job.date_to, date_from=job.date_from, use_checkpoints=False, progress=progress)
+    failed = 0
     try:
-        await parser.run_daily_parse()
-        print(f"Парсинг за {target_date} успешно завершен")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {e}")
+        await parser.init_client()
+        for forum_id in pending:
+            forum_info = PLAYER_COMPLAINT_FORUMS.get(forum_id)
+            if forum_info is None:
+                await set_task_status(forum_id, BackfillStatus.FAILED, error="Форум не найден в PLAYER_COMPLAINT_FORUMS")
+                failed += 1
+                continue
+
+            print(f"\nЗагрузка форума {forum_info['name']} (ID: {forum_id})...")
+            await set_task_status(forum_id, BackfillStatus.RUNNING)
+            threads = await parser.parse_forum(forum_id, forum_info)
+
+            incomplete = set(forum_info["closed"]) & parser.incomplete_sections
+            if threads is None or incomplete:
+                await set_task_status(forum_id, BackfillStatus.FAILED, error=f"Не полностью загружены разделы: {sorted(incomplete)}")
+                failed += 1
+                continue
 
-def run_parser_for_date(target_date: str):
-    """Запуск парсера для конкретной даты"""
+            await set_task_status(forum_id, BackfillStatus.DONE, threads=threads)
+    except Exception:
+        # Прерывание (отмена, Ctrl+C) оставляет задачу в RUNNING для resume
+        await set_job_status(job.id, BackfillStatus.FAILED)
+        raise
+    finally:
+        await parser.close()
+    await parser.prune_page_cache()
+
+    await set_job_status(job.id, BackfillStatus.FAILED if failed else BackfillStatus.DONE)
+
+    print(f"Загрузка за {job.date_from} - {job.date_to} завершена, с ошибками: {failed}")
+    return job.id
+
+def parse_date_arg(value: str) -> date:
+    """Дата вида YYYY-M-D с дополнением месяца и дня нулями"""
+    parts = value.split('-')
+    if len(parts) != 3:
+        raise ValueError("Неверный формат даты. Ожидается YYYY-MM-DD")
+    year, month, day = parts
+    return date.fromisoformat(f"{year}-{month.zfill(2)}-{day.zfill(2)}")
+
+async def main(args):
+    await init_db()
     try:
-        if isinstance(target_date, str):
-            parts = target_date.split('-')
-            if len(parts) == 3:
-                year, month, day = parts
-                month = month.zfill(2)
-                day = day.zfill(2)
-                normalized_date = f"{year}-{month}-{day}"
-                target_date = date.fromisoformat(normalized_date)
-            else:
-                raise ValueError("Неверный формат даты. Ожидается YYYY-MM-DD")
-        
-        asyncio.create_task(scheduled_parser(target_date))
-    except ValueError as e:
-        print(f"Ошибка в формате даты: {e}")
+        if args.command == "backfill":
+            await run_backfill(args.date_from, args.date_to or args.date_from)
+        elif args.command == "resume":
+            await run_backfill(job_id=args.job_id)
+    finally:
+        shutdown_extract_pool()
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Парсер закрытых жалоб форума")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = commands.add_parser("backfill", help="Загрузка жалоб за период")
+    backfill_parser.add_argument("date_from", type=parse_date_arg)
+    backfill_parser.add_argument("date_to", type=parse_date_arg, nargs="?")
+
+    resume_parser = commands.add_parser("resume", help="Продолжение прерванной загрузки")
+    resume_parser.add_argument("job_id", type=uuid.UUID, nargs="?")
 
-def run_parser_background():
-    """Запуск парсера в фоновом режиме (для текущей даты)"""
-    asyncio.create_task(scheduled_parser())
\ No newline at end of file
+    asyncio.run(main(arg_parser.parse_args()))
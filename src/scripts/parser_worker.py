@@ -0,0 +1,91 @@
+from datetime import datetime
+import asyncio
+import json
+import socket
+import uuid
+
+from src.config import Config
+from src.database import init_db
+from src.redis_client import redis_client
+from src.scripts.parser_complaint import ForumParser, run_backfill, parse_date_arg
+from src.utils.forum_extract import shutdown_extract_pool
+from src.utils.parser_jobs import (
+    PARSER_QUEUE_KEY,
+    get_parser_job,
+    update_parser_job,
+    set_forum_progress,
+)
+
+# Задачи, взятые воркером в работу; у каждого воркера свой список, при его
+# перезапуске в очередь возвращаются только его задачи. Идентификатор должен
+# сохраняться между перезапусками (PARSER_WORKER_ID, по умолчанию имя хоста).
+WORKER_ID = Config.PARSER_WORKER_ID or socket.gethostname()
+PARSER_PROCESSING_KEY = f"parser:jobs:processing:{WORKER_ID}"
+POLL_TIMEOUT_SECONDS = 5
+
+async def run_job(job_id: str) -> None:
+    job = await get_parser_job(job_id)
+    if job is None:
+        print(f"Задача парсера {job_id} не найдена (истек срок хранения)")
+        return
+
+    await update_parser_job(job_id, status="running", started_at=datetime.now().isoformat())
+
+    async def progress(forum_id: int, data: dict) -> None:
+        await set_forum_progress(job_id, forum_id, data)
+
+    params = job["params"]
+    try:
+        if job["kind"] == "daily":
+            target_date = parse_date_arg(params["date"]) if params.get("date") else None
+            summary = await ForumParser(target_date=target_date, progress=progress).run_daily_parse()
+            await update_parser_job(job_id, summary=json.dumps(summary, ensure_ascii=False))
+        elif job["kind"] == "backfill":
+            await run_backfill(
+                parse_date_arg(params["date_from"]),
+                parse_date_arg(params["date_to"]) if params.get("date_to") else None,
+                progress=progress
+            )
+        elif job["kind"] == "resume":
+            backfill_job_id = uuid.UUID(params["backfill_job_id"]) if params.get("backfill_job_id") else None
+            await run_backfill(job_id=backfill_job_id, progress=progress)
+        else:
+            raise ValueError(f"Неизвестный тип задачи парсера: {job['kind']}")
+    except Exception as e:
+        print(f"Ошибка при выполнении задачи парсера {job_id}: {e}")
+        await update_parser_job(job_id, status="failed", error=str(e), finished_at=datetime.now().isoformat())
+        return
+
+    await update_parser_job(job_id, status="done", finished_at=datetime.now().isoformat())
+
+async def requeue_interrupted_jobs() -> int:
+    """Задачи, прерванные падением этого воркера, снова ставятся в начало очереди"""
+    requeued = 0
+    while await redis_client.lmove(PARSER_PROCESSING_KEY, PARSER_QUEUE_KEY, "RIGHT", "LEFT"):
+        requeued += 1
+    return requeued
+
+async def worker() -> None:
+    """Отдельный процесс парсера: берет задачи из очереди Redis и пишет их статус обратно"""
+    await init_db()
+    requeued = await requeue_interrupted_jobs()
+    if requeued:
+        print(f"Возвращено в очередь прерванных задач парсера: {requeued}")
+
+    print(f"Воркер парсера {WORKER_ID} запущен, ожидание задач...")
+    while True:
+        job_id = await redis_client.blmove(PARSER_QUEUE_KEY, PARSER_PROCESSING_KEY, POLL_TIMEOUT_SECONDS, "LEFT", "RIGHT")
+        if job_id is None:
+            continue
+        try:
+            await run_job(job_id)
+        finally:
+            await redis_client.lrem(PARSER_PROCESSING_KEY, 1, job_id)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(worker())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_extract_pool()
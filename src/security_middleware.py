@@ -1,16 +1,16 @@
 from fastapi import Request, HTTPException
 from typing import Union, List
 
-from src.utils.security import SecurityUtils
+from src.utils.security import SecurityUtils, CLOSED_STATUSES, permissions_of
 from src.models.role_model import PermissionType, PermissionLevel
 from src.services.auth_handler import get_current_user
 
 class BasePermissionChecker:
     async def __call__(self, request: Request):
         try:
+            # Пользователь сохраняется в request.state.user и переиспользуется обработчиком
             user = await get_current_user(request)
             self.check_access(user)
-            request.state.user = user
             return True
         except PermissionError as e:
             raise HTTPException(status_code=403, detail=str(e))
@@ -77,48 +77,23 @@ class AppealPermissionChecker(BasePermissionChecker):
             raise PermissionError(f"Missing permission: {self.required_permission}")
         
         # Проверка типа обращения
-        if self.appeal_type and self.appeal_type not in self.get_allowed_appeal_types(user):
+        if self.appeal_type and not SecurityUtils.can_view_appeal_type(user, self.appeal_type):
             raise PermissionError(f"Not allowed to access {self.appeal_type} appeals")
 
     @staticmethod
     def get_allowed_appeal_types(user: dict) -> List[str]:
-        allowed_types = []
-        if SecurityUtils.has_permission_by_name(user, "respond_support_tickets"):
-            allowed_types.append("help")
-        if SecurityUtils.has_permission_by_name(user, "respond_moderation_complaints"):
-            allowed_types.append("complaint")
-        if SecurityUtils.has_permission_by_name(user, "respond_amnesty_requests"):
-            allowed_types.append("amnesty")
-        
-        if SecurityUtils.has_permission_by_name(user, "view_active_chats"):
-            return ["help", "complaint", "amnesty"]
-        
-        return allowed_types
+        access = permissions_of(user)
+        return list(access.appeal_types) if access else []
 
     @staticmethod
     def get_allowed_statuses(user: dict, appeal_type: str) -> List[str]:
-        allowed_statuses = []
-        
-        if appeal_type == "help" and SecurityUtils.has_permission_by_name(user, "respond_support_tickets"):
-            allowed_statuses.append("pending")
-        elif appeal_type == "complaint" and SecurityUtils.has_permission_by_name(user, "respond_moderation_complaints"):
-            allowed_statuses.append("pending")
-        elif appeal_type == "amnesty" and SecurityUtils.has_permission_by_name(user, "respond_amnesty_requests"):
-            allowed_statuses.append("pending")
-            
-        if SecurityUtils.has_permission_by_name(user, "view_active_chats"):
-            allowed_statuses.extend(["pending", "in_progress"])
-        
-        allowed_statuses.extend(["resolved", "rejected"])
-        return list(set(allowed_statuses))
+        access = permissions_of(user)
+        return list(access.allowed_statuses(appeal_type)) if access else list(CLOSED_STATUSES)
     
     @staticmethod
     def can_view_appeal(user: dict, appeal_type: str, appeal_status: str) -> bool:
         """Проверяет, может ли пользователь видеть обращение данного типа и статуса"""
-        allowed_types = AppealPermissionChecker.get_allowed_appeal_types(user)
-        
-        if appeal_type not in allowed_types:
+        access = permissions_of(user)
+        if access is None or appeal_type not in access.appeal_types:
             return False
-        
-        allowed_statuses = AppealPermissionChecker.get_allowed_statuses(user, appeal_type)
-        return appeal_status in allowed_statuses
\ No newline at end of file
+        return appeal_status in access.allowed_statuses(appeal_type)
@@ -17,6 +17,7 @@ from src.models.appeal_model import (
     AppealAssignment
 )
 from src.models.role_model import Role, PermissionLevel
+from src.utils.principal_cache import principal_cache
 
 
 class AdminService:
@@ -492,6 +493,7 @@ class AdminService:
         self.session.add(active_ban)
         self.session.add(user)
         await self.session.commit()
+        await principal_cache.invalidate(user_id)
         
         history = UserHistory(
             user_id=user_id,
@@ -548,6 +550,7 @@ class AdminService:
         self.session.add(ban)
         self.session.add(user)
         await self.session.commit()
+        await principal_cache.invalidate(user_id)
         
         history = UserHistory(
             user_id=user_id,
@@ -599,6 +602,7 @@ class AdminService:
         user.role_id = role.id
         self.session.add(user)
         await self.session.commit()
+        await principal_cache.invalidate(user_id)
         
         # Записываем в историю
         history = UserHistory(
@@ -710,6 +714,10 @@ class AdminService:
         self.session.add(request)
         await self.session.commit()
         
+        if action == 'approve':
+            # Ник или активность аккаунта изменились - кэш пользователя устарел
+            await principal_cache.invalidate(request.user_id)
+        
         return True
     
     async def get_moderators_list(self) -> List[dict]:
@@ -1,28 +1,34 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Union
 from sqlalchemy import select, or_, and_, func
+from sqlalchemy.orm import noload
 from fastapi.security import HTTPBearer
-from passlib.context import CryptContext
-from fastapi import HTTPException, status, Response, Request
+from fastapi import HTTPException, status, Response, Request, WebSocket
 import uuid
 import jwt
 
 from src.config import Config
 from src.schemas.user_schema import Token
-from src.models.user_model import User, UserBan
+from src.models.user_model import User, UserBan, UserPermissionOverride
 from src.models.role_model import Role
+from src.utils.principal_cache import principal_cache
+from src.utils.last_seen import last_seen
+from src.utils.security import compile_permissions
+from src.utils.password_hasher import password_hasher
 
 from src.database import get_session
 
 security = HTTPBearer()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    """Проверка пароля и новый хэш, если стоимость bcrypt изменилась (иначе None)"""
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -84,69 +90,49 @@ def clear_auth_cookies(response: Response) -> None:
     response.delete_cookie("access_token", path="/")
     response.delete_cookie("refresh_token", path="/")
 
-async def get_current_user(request: Request, raise_exception: bool = True) -> dict:
-    """Получает пользователя из access token cookie"""
-    token = request.cookies.get("access_token")
-    if not token:
-        if raise_exception:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Not authenticated"
-            )
-        return None
-    
-    try:
-        payload = decode_token(token)
-        
-        if payload.get("type") == "refresh":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token cannot be used as access token"
-            )
-        
-        user_id = uuid.UUID(payload.get("sub"))
-        
-        async for session in get_session():
-            # Проверяем, не заблокирован ли пользователь
-            ban_result = await session.execute(
-                select(UserBan)
-                .where(
-                    and_(
-                        UserBan.user_id == user_id,
-                        UserBan.is_active == True,
-                        or_(
-                            UserBan.expires_at == None,
-                            UserBan.expires_at > func.now()
-                        )
+async def load_principal(user_id: uuid.UUID) -> Optional[dict]:
+    """
+    Запись кэша пользователя из базы: principal (пользователь, роль,
+    переопределения прав) и активный бан. None - пользователь не найден.
+    """
+    async for session in get_session():
+        ban_result = await session.execute(
+            select(UserBan.reason, UserBan.expires_at)
+            .where(
+                and_(
+                    UserBan.user_id == user_id,
+                    UserBan.is_active == True,
+                    or_(
+                        UserBan.expires_at == None,
+                        UserBan.expires_at > func.now()
                     )
                 )
             )
-            ban = ban_result.scalar()
-            
-            if ban:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Ваш аккаунт заблокирован. Причина: {ban.reason}"
-                )
-            
-            # Получаем пользователя и роль
-            result = await session.execute(
-                select(User, Role)
-                .join(Role, User.role_id == Role.id)
-                .where(User.id == user_id)
+            .order_by(UserBan.expires_at.desc().nulls_first())
+            .limit(1)
+        )
+        ban = ban_result.first()
+
+        # Связи пользователя с обращениями и назначениями для авторизации не нужны
+        result = await session.execute(
+            select(User, Role, UserPermissionOverride.permissions)
+            .join(Role, User.role_id == Role.id)
+            .outerjoin(UserPermissionOverride, UserPermissionOverride.user_id == User.id)
+            .options(
+                noload(User.role),
+                noload(User.override_permission),
+                noload(User.appeals),
+                noload(User.assignments)
             )
-            user, role = result.first()
-            
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
-                
-            user.last_login = datetime.now()
-            session.commit()
-            
-            return {
+            .where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        user, role, override_permissions = row
+
+        return {
+            "principal": {
                 "id": user.id,
                 "email": user.email,
                 "username": user.username,
@@ -156,10 +142,79 @@ async def get_current_user(request: Request, raise_exception: bool = True) -> di
                     "permissions": role.permissions,
                     "name": role.name
                 },
+                "override_permission": {"permissions": override_permissions} if override_permissions else None,
                 "is_active": user.is_active,
                 "last_login": user.last_login.isoformat() if user.last_login else None,
                 "created_at": user.created_at
-            }
+            },
+            "ban": {"reason": ban.reason, "expires_at": ban.expires_at} if ban else None
+        }
+
+def is_ban_active(ban: Optional[dict]) -> bool:
+    if not ban:
+        return False
+    return ban["expires_at"] is None or ban["expires_at"] > datetime.now(timezone.utc)
+
+async def resolve_principal(token: str) -> dict:
+    """
+    Пользователь по access token. Берется из кэша (principal_cache),
+    в базу запрос идет только при промахе.
+    """
+    payload = decode_token(token)
+    
+    if payload.get("type") == "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token cannot be used as access token"
+        )
+    
+    user_id = uuid.UUID(payload.get("sub"))
+    
+    entry = await principal_cache.get(user_id)
+    if entry is None:
+        entry = await load_principal(user_id)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        await principal_cache.set(user_id, entry)
+
+    # Проверяем, не заблокирован ли пользователь
+    if is_ban_active(entry["ban"]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Ваш аккаунт заблокирован. Причина: {entry['ban']['reason']}"
+        )
+
+    principal = entry["principal"]
+    principal["access"] = compile_permissions(principal)
+    return principal
+
+async def get_current_user(request: Request, raise_exception: bool = True) -> dict:
+    """
+    Получает пользователя из access token cookie. Пользователь определяется
+    один раз за запрос и сохраняется в request.state.user - проверки прав
+    и обработчик маршрута получают один и тот же объект.
+    """
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+
+    token = request.cookies.get("access_token")
+    if not token:
+        if raise_exception:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated"
+            )
+        return None
+    
+    try:
+        user = await resolve_principal(token)
+        request.state.user = user
+        last_seen.touch(user["id"])
+        return user
     except HTTPException as e:
         if e.status_code == 403:
             raise
@@ -174,48 +229,51 @@ async def get_current_user(request: Request, raise_exception: bool = True) -> di
             )
         return None
 
-async def get_current_user_websoket(token: str) -> dict:
-    """Получает пользователя из access token"""
+# Коды закрытия веб-сокета при ошибке авторизации (диапазон 4000-4999
+# для приложения), клиент различает по ним причину отказа
+WS_CLOSE_NO_TOKEN = 4401
+WS_CLOSE_INVALID_TOKEN = 4402
+WS_CLOSE_BANNED = 4403
+WS_CLOSE_USER_NOT_FOUND = 4404
+# Ограничение протокола на длину причины закрытия
+WS_CLOSE_REASON_BYTES = 123
+
+class WebSocketAuthError(Exception):
+    """Отказ в авторизации веб-сокета: код и причина для websocket.close"""
+    def __init__(self, code: int, reason: str):
+        super().__init__(reason)
+        self.code = code
+        self.reason = reason.encode("utf-8")[:WS_CLOSE_REASON_BYTES].decode("utf-8", "ignore")
+
+async def get_current_user_websoket(websocket: WebSocket) -> dict:
+    """
+    Получает пользователя из access token cookie веб-сокета, один раз
+    за соединение (сохраняется в websocket.state.user). При отказе
+    вызывает WebSocketAuthError с отдельным кодом для каждой причины.
+    """
+    user = getattr(websocket.state, "user", None)
+    if user is not None:
+        return user
+
+    token = websocket.cookies.get("access_token")
+    if not token:
+        raise WebSocketAuthError(WS_CLOSE_NO_TOKEN, "Токен не найден")
+
     try:
-        payload = decode_token(token)
-        
-        if payload.get("type") == "refresh":
-            raise Exception("Refresh token cannot be used as access token")
-        
-        user_id = uuid.UUID(payload.get("sub"))
-        
-        async for session in get_session():
-            result = await session.execute(
-                select(User, Role)
-                .join(Role, User.role_id == Role.id)
-                .where(User.id == user_id)
-            )
-            user, role = result.first()
-            
-            if not user:
-                raise Exception("User not found")
-            
-            return {
-                "id": user.id,
-                "email": user.email,
-                "username": user.username,
-                "role": {
-                    "id": role.id,
-                    "level": role.level,
-                    "permissions": role.permissions,
-                    "name": role.name
-                },
-                "is_active": user.is_active,
-                "last_login": user.last_login,
-                "created_at": user.created_at
-            }
-            
-    except jwt.ExpiredSignatureError:
-        raise Exception("Срок действия токена истек")
-    except jwt.PyJWTError:
-        raise Exception("Недействительный токен")
-    except Exception as e:
-        raise Exception(f"Ошибка авторизации: {str(e)}")
+        user = await resolve_principal(token)
+    except HTTPException as e:
+        if e.status_code == status.HTTP_403_FORBIDDEN:
+            raise WebSocketAuthError(WS_CLOSE_BANNED, e.detail)
+        if e.status_code == status.HTTP_404_NOT_FOUND:
+            raise WebSocketAuthError(WS_CLOSE_USER_NOT_FOUND, "Пользователь не найден")
+        raise WebSocketAuthError(WS_CLOSE_INVALID_TOKEN, f"Недействительный токен: {e.detail}")
+    except ValueError:
+        # sub токена не является UUID
+        raise WebSocketAuthError(WS_CLOSE_INVALID_TOKEN, "Недействительный токен")
+
+    websocket.state.user = user
+    last_seen.touch(user["id"])
+    return user
 
 async def get_username_by_id(user_id: uuid.UUID) -> dict:
     async for session in get_session():
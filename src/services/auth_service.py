@@ -12,6 +12,7 @@ from src.models.user_model import User, UserRequest, UserRequestType
 from src.config import Config
 from src.services.auth_handler import (
     verify_password,
+    verify_and_update_password,
     get_password_hash,
     create_tokens,
     refresh_tokens,
@@ -50,7 +51,7 @@ class AuthService:
                 detail="Возникла проблема, повторите попытку позже",
             )
         
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash(user_data.password)
         
         user = User(
             username=user_data.username,
@@ -165,13 +166,26 @@ class AuthService:
             )
         )
         
-        if not user or not verify_password(credentials.password, user.hash_pasw):
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail='Логин или пароль неверны',
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        valid, new_hash = await verify_and_update_password(credentials.password, user.hash_pasw)
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Логин или пароль неверны',
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        if new_hash:
+            # Стоимость bcrypt изменилась - хэш пересчитан по введенному паролю
+            user.hash_pasw = new_hash
+            await self.session.commit()
+        
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -201,13 +215,13 @@ class AuthService:
             if not current_user:
                 raise HTTPException(status_code=404, detail="Пользователь не найден")
             
-            if not verify_password(change_request.current_password, current_user.hash_pasw):
+            if not await verify_password(change_request.current_password, current_user.hash_pasw):
                 raise HTTPException(status_code=400, detail="Неверный текущий пароль")
             
-            hashed_password = get_password_hash(change_request.new_password)
+            hashed_password = await get_password_hash(change_request.new_password)
             current_user.hash_pasw = hashed_password
             self.session.add(current_user)
-            self.session.commit()
+            await self.session.commit()
             
             return {"message": "Успешно"}
             
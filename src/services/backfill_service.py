@@ -0,0 +1,73 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from typing import Optional, Dict, Iterable, List
+from datetime import date
+import uuid
+
+from src.models.parser_model import BackfillJob, BackfillTask, BackfillStatus
+
+class BackfillService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_job(self, date_from: date, date_to: date, forum_ids: Iterable[int]) -> BackfillJob:
+        """Новая задача загрузки за период с отдельной записью на каждый форум"""
+        job = BackfillJob(date_from=date_from, date_to=date_to)
+        self.session.add(job)
+        await self.session.flush()
+
+        self.session.add_all([BackfillTask(job_id=job.id, forum_id=forum_id) for forum_id in forum_ids])
+        await self.session.flush()
+        return job
+
+    async def get_job(self, job_id: uuid.UUID) -> Optional[BackfillJob]:
+        result = await self.session.execute(select(BackfillJob).where(BackfillJob.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def get_unfinished_job(self) -> Optional[BackfillJob]:
+        """Последняя прерванная или не начатая задача"""
+        result = await self.session.execute(
+            select(BackfillJob)
+            .where(BackfillJob.status.in_([BackfillStatus.PENDING, BackfillStatus.RUNNING, BackfillStatus.FAILED]))
+            .order_by(BackfillJob.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_pending_forums(self, job_id: uuid.UUID) -> List[int]:
+        """Форумы задачи, которые еще не загружены (в том числе прерванные и упавшие)"""
+        result = await self.session.execute(
+            select(BackfillTask.forum_id)
+            .where(BackfillTask.job_id == job_id, BackfillTask.status != BackfillStatus.DONE)
+            .order_by(BackfillTask.forum_id)
+        )
+        return list(result.scalars().all())
+
+    async def set_job_status(self, job_id: uuid.UUID, status: BackfillStatus) -> None:
+        await self.session.execute(
+            update(BackfillJob).where(BackfillJob.id == job_id).values(status=status)
+        )
+
+    async def set_task_status(
+        self,
+        job_id: uuid.UUID,
+        forum_id: int,
+        status: BackfillStatus,
+        threads: int = 0,
+        error: Optional[str] = None
+    ) -> None:
+        await self.session.execute(
+            update(BackfillTask)
+            .where(BackfillTask.job_id == job_id, BackfillTask.forum_id == forum_id)
+            .values(status=status, threads=threads, error=error)
+        )
+
+    async def get_progress(self, job_id: uuid.UUID) -> Dict[int, Dict]:
+        result = await self.session.execute(
+            select(BackfillTask.forum_id, BackfillTask.status, BackfillTask.threads, BackfillTask.error)
+            .where(BackfillTask.job_id == job_id)
+        )
+        return {
+            forum_id: {"status": status.value, "threads": threads, "error": error}
+            for forum_id, status, threads, error in result.all()
+        }
@@ -0,0 +1,138 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, or_, case, func, literal_column
+from typing import Optional, Dict, List, Tuple
+from datetime import date
+
+from src.database import get_session
+from src.models.complaint_model import Complaint, ComplaintStatus
+from src.utils.complaint_forums import PLAYER_COMPLAINT_FORUMS
+
+DELAY_HISTOGRAM_EDGES = [0, 6, 12, 24, 48, 72, 168]
+
+IS_RESOLVED = Complaint.status == ComplaintStatus.RESOLVED.value
+IS_REJECTED = Complaint.status == ComplaintStatus.REJECTED.value
+IS_BAN = or_(Complaint.title.ilike("%бан%"), Complaint.title.ilike("%ban%"))
+IS_DELAYED = and_(IS_RESOLVED, Complaint.delay_hours != None)
+
+class ComplaintAnalyticsService:
+    """
+    Агрегации по жалобам выполняются в базе (GROUP BY по индексам
+    staff, status, start_day), процесс API не держит копию таблицы
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_staff_counters(self, *conditions) -> Dict[str, Dict[str, int]]:
+        """Счетчики жалоб по сотрудникам: всего, решено, отклонено, баны, просрочки"""
+        query = select(
+            Complaint.staff,
+            func.count(Complaint.id),
+            func.count(Complaint.id).filter(IS_RESOLVED),
+            func.count(Complaint.id).filter(IS_REJECTED),
+            func.count(Complaint.id).filter(IS_BAN),
+            func.count(Complaint.id).filter(IS_DELAYED)
+        ).where(Complaint.staff != None, *conditions).group_by(Complaint.staff)
+
+        result = await self.session.execute(query)
+        return {
+            staff: {"total": total, "resolved": resolved, "rejected": rejected, "bans": bans, "delays": delays}
+            for staff, total, resolved, rejected, bans, delays in result.all()
+            if staff
+        }
+
+    async def get_daily_counts(self) -> Dict[Tuple[str, date], int]:
+        """Число жалоб по сотрудникам и дням"""
+        result = await self.session.execute(
+            select(Complaint.staff, Complaint.start_day, func.count(Complaint.id))
+            .where(Complaint.staff != None, Complaint.start_day != None)
+            .group_by(Complaint.staff, Complaint.start_day)
+        )
+        return {(staff, day): count for staff, day, count in result.all() if staff}
+
+    async def get_analytics(
+        self,
+        admin: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Dict:
+        """Сводка по жалобам: по сотрудникам, статусам, серверам и распределение просрочек"""
+        conditions = []
+        if admin:
+            conditions.append(Complaint.staff.ilike(f"%{admin}%"))
+        if status:
+            conditions.append(Complaint.status == status)
+        if date_from:
+            conditions.append(Complaint.start_day >= date_from)
+        if date_to:
+            conditions.append(Complaint.start_day <= date_to)
+
+        status_result = await self.session.execute(
+            select(Complaint.status, func.count(Complaint.id))
+            .where(*conditions)
+            .group_by(Complaint.status)
+        )
+        by_status = dict(status_result.all())
+
+        staff_counters = await self.get_staff_counters(*conditions)
+        by_staff = [{"staff": staff, **counters} for staff, counters in staff_counters.items()]
+        by_staff.sort(key=lambda x: x["total"], reverse=True)
+
+        server_result = await self.session.execute(
+            select(
+                Complaint.forum_id,
+                func.count(Complaint.id),
+                func.count(Complaint.id).filter(IS_RESOLVED),
+                func.count(Complaint.id).filter(IS_REJECTED)
+            ).where(*conditions).group_by(Complaint.forum_id)
+        )
+        by_server = [
+            {
+                "forum_id": forum_id,
+                "server": PLAYER_COMPLAINT_FORUMS.get(forum_id, {}).get("name", "Не указан"),
+                "total": total,
+                "resolved": resolved,
+                "rejected": rejected
+            }
+            for forum_id, total, resolved, rejected in server_result.all()
+        ]
+        by_server.sort(key=lambda x: x["total"], reverse=True)
+
+        return {
+            "total": sum(by_status.values()),
+            "by_status": {status_value: count for status_value, count in by_status.items() if status_value},
+            "by_staff": by_staff,
+            "by_server": by_server,
+            "delay_histogram": await self._delay_histogram(conditions)
+        }
+
+    async def _delay_histogram(self, conditions: List) -> List[Dict]:
+        """Просрочки решенных жалоб в интервалах [edges[i], edges[i+1]), последний интервал открыт"""
+        bucket = case(
+            *(
+                (Complaint.delay_hours < high, index)
+                for index, high in enumerate(DELAY_HISTOGRAM_EDGES[1:])
+            ),
+            else_=len(DELAY_HISTOGRAM_EDGES) - 1
+        ).label("bucket")
+        result = await self.session.execute(
+            select(bucket, func.count(Complaint.id))
+            .where(IS_DELAYED, Complaint.delay_hours >= DELAY_HISTOGRAM_EDGES[0], *conditions)
+            # По псевдониму: повтор CASE с параметрами Postgres не считает тем же выражением
+            .group_by(literal_column("bucket"))
+        )
+        counts = dict(result.all())
+        return [
+            {
+                "range": f"{low}-{high}" if high is not None else f"{low}+",
+                "count": counts.get(index, 0)
+            }
+            for index, (low, high) in enumerate(zip(
+                DELAY_HISTOGRAM_EDGES,
+                DELAY_HISTOGRAM_EDGES[1:] + [None]
+            ))
+        ]
+
+async def get_complaint_analytics_service(session: AsyncSession = Depends(get_session)) -> ComplaintAnalyticsService:
+    return ComplaintAnalyticsService(session)
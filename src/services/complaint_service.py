@@ -0,0 +1,266 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func
+from typing import Optional, Dict, List, Iterable, AsyncIterator, BinaryIO, Set, Tuple
+from pathlib import Path
+from datetime import datetime
+import uuid
+import os
+import re
+
+from src.database import get_session
+from src.models.complaint_model import Complaint, DELAY_THRESHOLD_HOURS
+from src.utils.file_cache import complaint_file_cache
+from src.utils.json_stream import JsonArrayStream
+from src.services.staff_stats_service import StaffStatsService
+from src.services.staff_activity_service import StaffActivityService, invalidate_activity_cache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+COMPLAINT_DIR = PROJECT_ROOT / "storage/complaint"
+
+REPORTS_FILE_PATTERN = re.compile(r'\d{8}_reports\.json$')
+UPSERT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+REQUIRED_FIELDS = ['staff', 'status', 'startDate', 'endDate', 'reportDate', 'link', 'report_id']
+
+def parse_complaint_date(value: Optional[str]) -> Optional[datetime]:
+    """Разбор даты жалобы (ISO 8601, в том числе со смещением вида +0300)"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    except ValueError:
+        return None
+
+def same_awareness(start_date: Optional[datetime], end_date: Optional[datetime]) -> bool:
+    """Обе даты с часовым поясом или обе без него (иначе их нельзя вычитать)"""
+    if start_date is None or end_date is None:
+        return True
+    return (start_date.tzinfo is None) == (end_date.tzinfo is None)
+
+def normalize_complaint(
+    record: Dict,
+    source: str = "upload",
+    dates: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None
+) -> Optional[Dict]:
+    """
+    Приводит запись жалобы (из выгрузки или парсера) к строке таблицы complaints.
+    dates - уже разобранные (startDate, endDate), если запись прошла validate_complaint.
+    """
+    report_id = record.get("report_id")
+    if report_id is None or report_id == "":
+        return None
+
+    payload = dict(record)
+    staff = record.get("staff") or record.get("admin")
+    if staff and not payload.get("staff"):
+        payload["staff"] = staff
+
+    if dates is None:
+        dates = (parse_complaint_date(record.get("startDate")), parse_complaint_date(record.get("endDate")))
+    start_date, end_date = dates
+    forum_id = record.get("forum_id")
+
+    # Время обработки и просрочка считаются один раз при загрузке
+    processing_hours = delay_hours = None
+    if start_date and end_date and same_awareness(start_date, end_date):
+        processing_hours = (end_date - start_date).total_seconds() / 3600
+        if processing_hours > DELAY_THRESHOLD_HOURS:
+            delay_hours = int(processing_hours - DELAY_THRESHOLD_HOURS)
+
+    return {
+        "report_id": str(report_id),
+        "forum_id": forum_id if isinstance(forum_id, int) else None,
+        "staff": staff,
+        "status": record.get("status"),
+        "title": record.get("title"),
+        "link": record.get("link"),
+        "report_date": str(record["reportDate"]) if record.get("reportDate") else None,
+        "start_date": start_date,
+        "start_day": start_date.date() if start_date else None,
+        "end_date": end_date,
+        "processing_hours": processing_hours,
+        "delay_hours": delay_hours,
+        "source": source,
+        "payload": payload
+    }
+
+def validate_complaint(record) -> Tuple[Optional[str], Optional[Tuple[datetime, Optional[datetime]]]]:
+    """
+    Проверяет запись выгрузки. Возвращает текст ошибки (или None)
+    и разобранные даты (startDate, endDate) для normalize_complaint.
+    """
+    if not isinstance(record, dict):
+        return "Запись должна быть объектом", None
+
+    missing = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing:
+        return f"Отсутствуют обязательные поля: {', '.join(missing)}", None
+
+    if record["report_id"] is None or record["report_id"] == "":
+        return "Пустой report_id", None
+    start_date = parse_complaint_date(record["startDate"])
+    if start_date is None:
+        return f"Некорректная дата startDate: {record['startDate']}", None
+    end_date = parse_complaint_date(record["endDate"]) if record["endDate"] else None
+    if record["endDate"] and end_date is None:
+        return f"Некорректная дата endDate: {record['endDate']}", None
+    if not same_awareness(start_date, end_date):
+        return "Даты startDate и endDate должны быть обе с часовым поясом или обе без него", None
+    return None, (start_date, end_date)
+
+class ComplaintService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def upsert_complaints(self, records: Iterable[Dict], source: str = "upload") -> int:
+        """Записывает жалобы в хранилище, обновляя существующие по report_id"""
+        rows: Dict[str, Dict] = {}
+        for record in records:
+            row = normalize_complaint(record, source)
+            if row:
+                # В одном INSERT ... ON CONFLICT ключ не может встречаться дважды
+                rows[row["report_id"]] = row
+
+        if not rows:
+            return 0
+
+        batch = list(rows.values())
+        touched_months = set()
+        for start in range(0, len(batch), UPSERT_BATCH_SIZE):
+            touched_months |= await self._upsert_batch(batch[start:start + UPSERT_BATCH_SIZE])
+
+        await self.session.commit()
+        await invalidate_activity_cache(touched_months)
+        return len(batch)
+
+    async def ingest_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        source: str = "upload",
+        archive: Optional[BinaryIO] = None
+    ) -> Dict:
+        """
+        Потоковая загрузка выгрузки жалоб: JSON массив разбирается по кускам,
+        каждая запись проверяется, корректные пишутся в хранилище пачками.
+        Все пачки применяются в одной транзакции. Повторы report_id
+        считаются одной жалобой (остается последняя запись).
+        """
+        parser = JsonArrayStream()
+        batch: Dict[str, Dict] = {}
+        seen_ids: Set[str] = set()
+        rejected = duplicates = row_number = 0
+        errors = []
+        touched_months = set()
+
+        async def consume(items: List) -> None:
+            nonlocal rejected, duplicates, row_number
+            for item in items:
+                row_number += 1
+                error, dates = validate_complaint(item)
+                if error:
+                    rejected += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"row": row_number, "error": error})
+                    continue
+
+                row = normalize_complaint(item, source, dates)
+                if row["report_id"] in seen_ids:
+                    duplicates += 1
+                seen_ids.add(row["report_id"])
+                batch[row["report_id"]] = row
+                if len(batch) >= UPSERT_BATCH_SIZE:
+                    touched_months.update(await self._upsert_batch(list(batch.values())))
+                    batch.clear()
+
+        try:
+            async for chunk in chunks:
+                if archive is not None:
+                    archive.write(chunk)
+                await consume(parser.feed(chunk))
+
+            await consume(parser.close())
+            if batch:
+                touched_months.update(await self._upsert_batch(list(batch.values())))
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        await invalidate_activity_cache(touched_months)
+
+        return {
+            "accepted": len(seen_ids),
+            "rejected": rejected,
+            "duplicates": duplicates,
+            "errors": errors
+        }
+
+    async def _upsert_batch(self, rows: List[Dict]) -> Set[Tuple[int, int]]:
+        """Записывает пачку жалоб, возвращает затронутые месяцы графика активности"""
+        for row in rows:
+            row.setdefault("id", uuid.uuid4())
+
+        # Прежние версии жалоб нужны, чтобы скорректировать сводную статистику и активность
+        existing = await self.session.execute(
+            select(Complaint.staff, Complaint.status, Complaint.title, Complaint.delay_hours, Complaint.start_day)
+            .where(Complaint.report_id.in_([row["report_id"] for row in rows]))
+            .with_for_update()
+        )
+        old_rows = [row._asdict() for row in existing.all()]
+
+        stmt = insert(Complaint).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Complaint.report_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0].keys()
+                if column not in ("id", "report_id")
+            } | {"updated_at": func.now()}
+        )
+        await self.session.execute(stmt)
+        await StaffStatsService(self.session).apply_complaint_changes(old_rows, rows)
+        return await StaffActivityService(self.session).apply_complaint_changes(old_rows, rows)
+
+    async def existing_report_ids(self, report_ids: Iterable[str]) -> Set[str]:
+        """report_id из переданных, которые уже есть в хранилище"""
+        report_ids = list(report_ids)
+        if not report_ids:
+            return set()
+        result = await self.session.execute(
+            select(Complaint.report_id).where(Complaint.report_id.in_(report_ids))
+        )
+        return set(result.scalars().all())
+
+    async def is_empty(self) -> bool:
+        result = await self.session.execute(select(Complaint.id).limit(1))
+        return result.first() is None
+
+    async def import_legacy_files(self) -> int:
+        """Переносит жалобы из файлов ddmmyyyy_reports.json в хранилище"""
+        if not COMPLAINT_DIR.exists():
+            return 0
+
+        imported = 0
+        for filename in sorted(os.listdir(COMPLAINT_DIR)):
+            if not REPORTS_FILE_PATTERN.match(filename):
+                continue
+            try:
+                file_data = complaint_file_cache.load(COMPLAINT_DIR / filename)
+            except Exception as e:
+                print(f"Ошибка при чтении файла {filename}: {str(e)}")
+                continue
+
+            if isinstance(file_data, list):
+                imported += await self.upsert_complaints(file_data, source="upload")
+
+        return imported
+
+async def get_complaint_service(session: AsyncSession = Depends(get_session)) -> ComplaintService:
+    return ComplaintService(session)
@@ -0,0 +1,41 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func
+from typing import Dict, Iterable, Tuple
+from datetime import date, datetime
+import uuid
+
+from src.models.parser_model import CrawlCheckpoint
+
+class CrawlCheckpointService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_checkpoints(self, closed_forum_ids: Iterable[int]) -> Dict[int, Tuple[int, date]]:
+        """Контрольные точки разделов: closed_forum_id -> (ID темы, день темы)"""
+        result = await self.session.execute(
+            select(CrawlCheckpoint.closed_forum_id, CrawlCheckpoint.thread_id, CrawlCheckpoint.thread_date)
+            .where(CrawlCheckpoint.closed_forum_id.in_(list(closed_forum_ids)))
+        )
+        return {closed_forum_id: (thread_id, thread_date) for closed_forum_id, thread_id, thread_date in result.all()}
+
+    async def advance(self, closed_forum_id: int, thread_id: int, thread_started_at: datetime) -> None:
+        """Сдвигает контрольную точку раздела вперед (более старая тема ее не откатывает)"""
+        stmt = insert(CrawlCheckpoint).values(
+            id=uuid.uuid4(),
+            closed_forum_id=closed_forum_id,
+            thread_id=thread_id,
+            thread_started_at=thread_started_at,
+            thread_date=thread_started_at.date()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CrawlCheckpoint.closed_forum_id],
+            set_={
+                "thread_id": stmt.excluded.thread_id,
+                "thread_started_at": stmt.excluded.thread_started_at,
+                "thread_date": stmt.excluded.thread_date,
+                "updated_at": func.now()
+            },
+            where=CrawlCheckpoint.thread_id < stmt.excluded.thread_id
+        )
+        await self.session.execute(stmt)
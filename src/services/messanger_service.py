@@ -2,6 +2,8 @@ from src.models.appeal_model import AppealMessage, Appeal, AppealAssignment, App
 from src.models.user_model import SupportAssignment, User
 from src.database import get_session
 from src.models.appeal_model import AppealMessage
+from src.services.staff_stats_service import StaffStatsService
+from src.services.staff_activity_service import StaffActivityService, invalidate_activity_cache
 
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -148,6 +150,7 @@ class MessangerService:
             raise ValueError("Appeal not found")
         
         appeal.status = new_status
+        touched_months = set()
         
         if assigned_to:
             await self.session.execute(
@@ -167,11 +170,17 @@ class MessangerService:
                 assigned_at=func.now()
             )
             self.session.add(assignment)
+            touched_months = await StaffActivityService(self.session).add_appeal_assignment(
+                assigned_to,
+                appeal.created_at
+            )
             
             if assigned_by:
                 await self.notify_moderator_assignment(appeal_id, assigned_to, assigned_by)
         
+        await StaffStatsService(self.session).refresh_appeal_counters(appeal_id)
         await self.session.commit()
+        await invalidate_activity_cache(touched_months)
         await self.notify_appeal_update(appeal_id, "status_changed")
     
     async def reassign_appeal(
@@ -205,6 +214,7 @@ class MessangerService:
 
         new_moderator_id = None
         system_message = ""
+        touched_months = set()
 
         if reassign_type == 'unassign':
             # Тип 1: Снять модератора
@@ -250,6 +260,10 @@ class MessangerService:
                 assigned_at=func.now()
             )
             self.session.add(new_assignment)
+            touched_months = await StaffActivityService(self.session).add_appeal_assignment(
+                new_moderator_id,
+                appeal.created_at
+            )
             
             # Получаем имя модератора
             moderator = await self.session.get(User, new_moderator_id)
@@ -267,7 +281,9 @@ class MessangerService:
             )
             self.session.add(system_msg)
         
+        await StaffStatsService(self.session).refresh_appeal_counters(appeal_id)
         await self.session.commit()
+        await invalidate_activity_cache(touched_months)
         
         await self.notify_appeal_update(appeal_id, "reassigned")
 
@@ -298,6 +314,7 @@ class MessangerService:
         )
         
         appeal.status = status
+        await StaffStatsService(self.session).refresh_appeal_counters(appeal_id)
         await self.notify_appeal_update(appeal_id, "closed")
         await self.session.commit()
 
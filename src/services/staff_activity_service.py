@@ -0,0 +1,116 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, delete, and_, func
+from typing import Optional, Dict, Iterable, Set, Tuple
+from datetime import date, datetime
+from collections import defaultdict
+import uuid
+
+from src.models.appeal_model import Appeal, AppealAssignment
+from src.models.user_model import User
+from src.services.complaint_analytics_service import ComplaintAnalyticsService
+from src.models.staff_activity_model import StaffDailyActivity
+from src.redis_client import redis_client
+
+SOURCE_COMPLAINT = "complaint"
+SOURCE_APPEAL = "appeal"
+INSERT_BATCH_SIZE = 1000
+
+def activity_cache_key(year: int, month: int) -> str:
+    return f"user_activity:{year}:{month:02d}"
+
+async def invalidate_activity_cache(months: Iterable[Tuple[int, int]]) -> None:
+    """Сброс закэшированных графиков активности за затронутые месяцы"""
+    keys = [activity_cache_key(year, month) for year, month in set(months)]
+    if not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except Exception as e:
+        print(f"Ошибка при сбросе кэша активности: {str(e)}")
+
+class StaffActivityService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_month_counts(self, start_day: date, end_day: date) -> Dict[str, Dict[str, int]]:
+        """Активность сотрудников по дням за период (жалобы и обращения вместе)"""
+        result = await self.session.execute(
+            select(
+                StaffDailyActivity.username,
+                StaffDailyActivity.day,
+                func.sum(StaffDailyActivity.count)
+            )
+            .where(and_(
+                StaffDailyActivity.day >= start_day,
+                StaffDailyActivity.day <= end_day
+            ))
+            .group_by(StaffDailyActivity.username, StaffDailyActivity.day)
+        )
+
+        activity = defaultdict(dict)
+        for username, day, count in result.all():
+            if count:
+                activity[username][day.strftime('%Y-%m-%d')] = int(count)
+        return activity
+
+    async def apply_complaint_changes(self, old_rows: Iterable[Dict], new_rows: Iterable[Dict]) -> Set[Tuple[int, int]]:
+        """
+        Переносит жалобы между днями/сотрудниками при их изменении.
+        Возвращает затронутые месяцы (год, месяц) для сброса кэша.
+        """
+        deltas = defaultdict(int)
+        for rows, sign in ((old_rows, -1), (new_rows, 1)):
+            for row in rows:
+                if row.get("staff") and row.get("start_day"):
+                    deltas[(row["staff"], row["start_day"])] += sign
+
+        deltas = {key: count for key, count in deltas.items() if count}
+        await self._add_counts(deltas, SOURCE_COMPLAINT)
+        return {(day.year, day.month) for _, day in deltas}
+
+    async def add_appeal_assignment(self, user_id: uuid.UUID, created_at: Optional[datetime]) -> Set[Tuple[int, int]]:
+        """Учитывает назначение сотрудника на обращение в дне создания обращения"""
+        result = await self.session.execute(select(User.username).where(User.id == user_id))
+        username = result.scalar()
+        if not username:
+            return set()
+
+        day = (created_at or datetime.now()).date()
+        await self._add_counts({(username, day): 1}, SOURCE_APPEAL)
+        return {(day.year, day.month)}
+
+    async def _add_counts(self, deltas: Dict[Tuple[str, date], int], source: str) -> None:
+        rows = [
+            {"id": uuid.uuid4(), "username": username, "day": day, "source": source, "count": count}
+            for (username, day), count in deltas.items()
+        ]
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            stmt = insert(StaffDailyActivity).values(rows[start:start + INSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_staff_daily_activity",
+                set_={"count": StaffDailyActivity.count + stmt.excluded.count}
+            )
+            await self.session.execute(stmt)
+
+    async def is_empty(self) -> bool:
+        result = await self.session.execute(select(StaffDailyActivity.id).limit(1))
+        return result.first() is None
+
+    async def rebuild(self) -> int:
+        """Полный пересчет активности из жалоб и назначений на обращения"""
+        complaint_counts = await ComplaintAnalyticsService(self.session).get_daily_counts()
+
+        appeal_day = func.date(Appeal.created_at)
+        appeal_result = await self.session.execute(
+            select(User.username, appeal_day, func.count(Appeal.id))
+            .join(AppealAssignment, AppealAssignment.appeal_id == Appeal.id)
+            .join(User, AppealAssignment.user_id == User.id)
+            .group_by(User.username, appeal_day)
+        )
+        appeal_counts = {(username, day): count for username, day, count in appeal_result.all()}
+
+        await self.session.execute(delete(StaffDailyActivity))
+        await self._add_counts(complaint_counts, SOURCE_COMPLAINT)
+        await self._add_counts(appeal_counts, SOURCE_APPEAL)
+        return len(complaint_counts) + len(appeal_counts)
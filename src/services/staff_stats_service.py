@@ -0,0 +1,424 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, update, delete, and_, or_, func, case, literal, Integer
+from typing import Optional, Dict, List, Iterable, Tuple
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+import uuid
+import os
+import json
+
+from src.models.appeal_model import Appeal, AppealStatus, AppealAssignment
+from src.models.user_model import User
+from src.models.complaint_model import ComplaintStatus
+from src.models.staff_stats_model import StaffStats
+from src.models.payout_model import PayoutSnapshot, StaffPayout
+from src.services.complaint_analytics_service import ComplaintAnalyticsService
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+USER_STATS_DIR = PROJECT_ROOT / "storage/user_stats"
+USER_STATS_FILE = USER_STATS_DIR / "custom_stats.json"
+
+SETTINGS_DIR = PROJECT_ROOT / "storage/settings"
+REWARD_SETTINGS_PATH = SETTINGS_DIR / "reward_settings.json"
+
+COMPLAINT_COUNTERS = ['complaints_total', 'complaints_resolved', 'complaints_rejected', 'bans_issued', 'delays']
+APPEAL_COUNTERS = ['appeals_total', 'appeals_resolved', 'appeals_rejected']
+OVERRIDE_FIELDS = ['complaints_resolved', 'complaints_rejected', 'bans_issued', 'delays']
+# Ключ advisory-блокировки выдачи номеров версий расчета
+PAYOUT_VERSION_LOCK = 7301
+
+# Настройки читаются при каждом пересчете выплат; файл перечитывается,
+# только если изменились его mtime или размер (в том числе другим процессом)
+_reward_settings_cache: Optional[Tuple[Tuple[int, int], Dict]] = None
+
+def _settings_signature() -> Tuple[int, int]:
+    stat = os.stat(REWARD_SETTINGS_PATH)
+    return stat.st_mtime_ns, stat.st_size
+
+def load_reward_settings() -> Dict:
+    """Чтение настроек вознаграждений, при отсутствии файла создаются настройки по умолчанию"""
+    global _reward_settings_cache
+    if not REWARD_SETTINGS_PATH.exists():
+        default_settings = {
+            "complaint_reward": 50,
+            "appeal_reward": 30,
+            "delay_penalty": 100,
+            "version": 1,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        save_reward_settings(default_settings)
+        return dict(default_settings)
+
+    signature = _settings_signature()
+    if _reward_settings_cache is None or _reward_settings_cache[0] != signature:
+        with open(REWARD_SETTINGS_PATH, 'r', encoding='utf-8') as f:
+            _reward_settings_cache = (signature, json.load(f))
+    return dict(_reward_settings_cache[1])
+
+def save_reward_settings(settings: Dict) -> None:
+    global _reward_settings_cache
+    os.makedirs(SETTINGS_DIR, exist_ok=True)
+    with open(REWARD_SETTINGS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=2, ensure_ascii=False)
+    _reward_settings_cache = (_settings_signature(), dict(settings))
+
+def load_custom_stats() -> Dict:
+    if not USER_STATS_FILE.exists():
+        return {}
+    with open(USER_STATS_FILE, 'r') as f:
+        return json.load(f)
+
+def complaint_counters(status: Optional[str], title: Optional[str], delay_hours: Optional[int]) -> Dict[str, int]:
+    """Вклад одной жалобы в счетчики сотрудника"""
+    is_resolved = status == ComplaintStatus.RESOLVED.value
+    title = (title or "").lower()
+    return {
+        'complaints_total': 1,
+        'complaints_resolved': int(is_resolved),
+        'complaints_rejected': int(status == ComplaintStatus.REJECTED.value),
+        'bans_issued': int("бан" in title or "ban" in title),
+        'delays': int(is_resolved and delay_hours is not None)
+    }
+
+def reward_coefficients(settings: Dict) -> Dict:
+    """Настройки без служебных полей (номер версии и время изменения)"""
+    return {key: value for key, value in settings.items() if key not in ("version", "updated_at")}
+
+# Коэффициент настроек -> счетчик, от которого зависит выплата
+REWARD_COUNTERS = {
+    'complaint_reward': 'complaints_resolved',
+    'complaint_rejected_reward': 'complaints_rejected',
+    'ban_reward': 'bans_issued',
+    'appeal_reward': 'appeals_resolved',
+    'delay_penalty': 'delays'
+}
+
+def effective_counter(field: str):
+    """Значение счетчика с учетом ручной правки (overrides) в виде SQL-выражения"""
+    column = getattr(StaffStats, field)
+    if field not in OVERRIDE_FIELDS:
+        return column
+    return func.coalesce(StaffStats.overrides[field].astext.cast(Integer), column)
+
+def payout_values(settings: Dict) -> Dict:
+    """
+    SQL-выражения штрафа, итоговой суммы и статуса выплаты по счетчикам,
+    ручным правкам и настройкам вознаграждений
+    """
+    fine = func.coalesce(
+        StaffStats.overrides['fine'].astext.cast(Integer),
+        effective_counter('delays') * settings.get('delay_penalty', 0)
+    )
+    total = func.greatest(0, sum(
+        effective_counter(field) * settings.get(key, 0)
+        for key, field in REWARD_COUNTERS.items()
+        if key != 'delay_penalty'
+    ) - fine)
+
+    return {
+        'fine': fine,
+        'total': total,
+        'payment_status': case((total > 0, "Ожидает"), else_="Выплачено")
+    }
+
+def changed_reward_counters(previous: Dict, current: Dict) -> List[str]:
+    """Счетчики, для которых изменился коэффициент вознаграждения"""
+    return [
+        field for key, field in REWARD_COUNTERS.items()
+        if previous.get(key, 0) != current.get(key, 0)
+    ]
+
+class StaffStatsService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_leaderboard(self, admin_name: str = "", page: int = 1, per_page: int = 20) -> Dict:
+        """Страница статистики сотрудников, отсортированная по сумме выплаты"""
+        conditions = [or_(StaffStats.complaints_total > 0, StaffStats.appeals_total > 0)]
+        if admin_name:
+            conditions.append(StaffStats.username.ilike(f"%{admin_name}%"))
+
+        total_result = await self.session.execute(
+            select(func.count()).select_from(StaffStats).where(and_(*conditions))
+        )
+        total = total_result.scalar()
+
+        result = await self.session.execute(
+            select(StaffStats)
+            .where(and_(*conditions))
+            .order_by(StaffStats.total.desc(), StaffStats.username)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+        )
+
+        return {
+            "users": [self._serialize(stats) for stats in result.scalars().all()],
+            "total": total,
+            "page": page,
+            "per_page": per_page
+        }
+
+    def _serialize(self, stats: StaffStats) -> Dict:
+        overrides = stats.overrides or {}
+        return {
+            'username': stats.username,
+            'server': overrides.get('server', "Не указан"),
+            **{field: overrides.get(field, getattr(stats, field)) for field in OVERRIDE_FIELDS},
+            'fine': stats.fine,
+            'appeals_resolved': stats.appeals_resolved,
+            'appeals_rejected': stats.appeals_rejected,
+            'total': stats.total,
+            'payment_status': stats.payment_status
+        }
+
+    async def apply_complaint_changes(self, old_rows: Iterable[Dict], new_rows: Iterable[Dict]) -> None:
+        """
+        Учитывает изменение набора жалоб: вклад старых версий вычитается,
+        вклад новых прибавляется. Строки - словари со staff/status/title/delay_hours.
+        """
+        deltas = defaultdict(lambda: dict.fromkeys(COMPLAINT_COUNTERS, 0))
+        for rows, sign in ((old_rows, -1), (new_rows, 1)):
+            for row in rows:
+                if not row.get("staff"):
+                    continue
+                counters = complaint_counters(row.get("status"), row.get("title"), row.get("delay_hours"))
+                for field, value in counters.items():
+                    deltas[row["staff"]][field] += sign * value
+
+        deltas = {
+            username: counters
+            for username, counters in deltas.items()
+            if any(counters.values())
+        }
+        if not deltas:
+            return
+
+        stmt = insert(StaffStats).values([
+            {"id": uuid.uuid4(), "username": username, **counters}
+            for username, counters in deltas.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StaffStats.username],
+            set_={
+                field: getattr(StaffStats, field) + stmt.excluded[field]
+                for field in COMPLAINT_COUNTERS
+            }
+        )
+        await self.session.execute(stmt)
+        await self.refresh_totals(deltas.keys())
+
+    async def refresh_appeal_counters(self, appeal_id: uuid.UUID) -> None:
+        """Пересчет счетчиков обращений для сотрудников, назначенных на обращение"""
+        # Сессия без autoflush: изменения обращения должны попасть в подсчет
+        await self.session.flush()
+        user_ids = select(AppealAssignment.user_id).where(AppealAssignment.appeal_id == appeal_id)
+        rows = await self._count_appeals(User.id.in_(user_ids))
+        if not rows:
+            return
+
+        stmt = insert(StaffStats).values([{"id": uuid.uuid4(), **row} for row in rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StaffStats.username],
+            set_={field: stmt.excluded[field] for field in APPEAL_COUNTERS}
+        )
+        await self.session.execute(stmt)
+        await self.refresh_totals([row["username"] for row in rows])
+
+    async def set_overrides(self, username: str, overrides: Dict) -> None:
+        """Сохраняет ручные правки статистики сотрудника"""
+        stmt = insert(StaffStats).values(id=uuid.uuid4(), username=username, overrides=overrides)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StaffStats.username],
+            set_={"overrides": stmt.excluded.overrides}
+        )
+        await self.session.execute(stmt)
+        await self.refresh_totals([username])
+
+    async def refresh_totals(self, usernames: Optional[Iterable[str]] = None) -> int:
+        """Пересчитывает выплаты указанных сотрудников (или всех) одним UPDATE"""
+        query = update(StaffStats).values(**payout_values(load_reward_settings()))
+        if usernames is not None:
+            usernames = list(usernames)
+            if not usernames:
+                return 0
+            query = query.where(StaffStats.username.in_(usernames))
+
+        result = await self.session.execute(query.execution_options(synchronize_session=False))
+        return result.rowcount
+
+    async def apply_reward_settings(self, previous: Dict, settings: Dict) -> PayoutSnapshot:
+        """
+        Пересчет выплат после смены настроек. Обновляются только сотрудники,
+        у которых ненулевой счетчик с измененным коэффициентом; результат
+        фиксируется новой версией расчета.
+        """
+        fields = changed_reward_counters(previous, settings)
+        recalculated = 0
+        if fields:
+            result = await self.session.execute(
+                update(StaffStats)
+                .where(or_(*(effective_counter(field) != 0 for field in fields)))
+                .values(**payout_values(settings))
+                .execution_options(synchronize_session=False)
+            )
+            recalculated = result.rowcount
+
+        return await self.create_snapshot(settings, recalculated)
+
+    async def create_snapshot(self, settings: Dict, recalculated: int = 0) -> PayoutSnapshot:
+        """
+        Сохраняет текущие выплаты всех сотрудников как версию расчета.
+        Номер версии выдается базой (max + 1 под блокировкой транзакции):
+        "version" в файле настроек только информационный, файл может
+        быть удален и начать отсчет заново.
+        """
+        await self.session.execute(select(func.pg_advisory_xact_lock(PAYOUT_VERSION_LOCK)))
+        result = await self.session.execute(select(func.coalesce(func.max(PayoutSnapshot.version), 0)))
+        version = result.scalar() + 1
+
+        snapshot = PayoutSnapshot(
+            version=version,
+            settings={**settings, "version": version},
+            recalculated=recalculated
+        )
+        self.session.add(snapshot)
+        await self.session.flush()
+
+        await self.session.execute(
+            insert(StaffPayout).from_select(
+                ["id", "snapshot_id", "username", "fine", "total", "payment_status"],
+                select(
+                    func.gen_random_uuid(),
+                    literal(snapshot.id),
+                    StaffStats.username,
+                    StaffStats.fine,
+                    StaffStats.total,
+                    StaffStats.payment_status
+                ).where(or_(StaffStats.complaints_total > 0, StaffStats.appeals_total > 0))
+            )
+        )
+
+        result = await self.session.execute(
+            select(func.count(StaffPayout.id), func.coalesce(func.sum(StaffPayout.total), 0))
+            .where(StaffPayout.snapshot_id == snapshot.id)
+        )
+        snapshot.staff_count, snapshot.payout_total = result.one()
+        await self.session.flush()
+        return snapshot
+
+    async def ensure_snapshot(self) -> Optional[PayoutSnapshot]:
+        """Создает версию расчета, если последняя посчитана с другими коэффициентами"""
+        settings = load_reward_settings()
+        result = await self.session.execute(
+            select(PayoutSnapshot.settings).order_by(PayoutSnapshot.version.desc()).limit(1)
+        )
+        latest = result.scalar_one_or_none()
+        if latest is not None and reward_coefficients(latest) == reward_coefficients(settings):
+            return None
+        return await self.create_snapshot(settings)
+
+    async def get_snapshots(self, limit: int = 20) -> List[Dict]:
+        """Последние версии расчета выплат"""
+        result = await self.session.execute(
+            select(PayoutSnapshot).order_by(PayoutSnapshot.version.desc()).limit(limit)
+        )
+        return [self._serialize_snapshot(snapshot) for snapshot in result.scalars().all()]
+
+    async def get_snapshot_payouts(self, version: int) -> Optional[Dict]:
+        """Выплаты сотрудников в указанной версии расчета"""
+        result = await self.session.execute(
+            select(PayoutSnapshot).where(PayoutSnapshot.version == version)
+        )
+        snapshot = result.scalar_one_or_none()
+        if snapshot is None:
+            return None
+
+        result = await self.session.execute(
+            select(StaffPayout)
+            .where(StaffPayout.snapshot_id == snapshot.id)
+            .order_by(StaffPayout.total.desc(), StaffPayout.username)
+        )
+        return {
+            **self._serialize_snapshot(snapshot),
+            "payouts": [
+                {
+                    "username": payout.username,
+                    "fine": payout.fine,
+                    "total": payout.total,
+                    "payment_status": payout.payment_status
+                }
+                for payout in result.scalars().all()
+            ]
+        }
+
+    def _serialize_snapshot(self, snapshot: PayoutSnapshot) -> Dict:
+        return {
+            "version": snapshot.version,
+            "settings": snapshot.settings,
+            "staff_count": snapshot.staff_count,
+            "recalculated": snapshot.recalculated,
+            "payout_total": snapshot.payout_total,
+            "created_at": snapshot.created_at.isoformat() if snapshot.created_at else None
+        }
+
+    async def is_empty(self) -> bool:
+        result = await self.session.execute(select(StaffStats.id).limit(1))
+        return result.first() is None
+
+    async def rebuild(self) -> int:
+        """Полный пересчет сводной статистики из жалоб, обращений и ручных правок"""
+        rows = defaultdict(lambda: dict.fromkeys(COMPLAINT_COUNTERS + APPEAL_COUNTERS, 0))
+
+        staff_counters = await ComplaintAnalyticsService(self.session).get_staff_counters()
+        for username, counters in staff_counters.items():
+            rows[username].update({
+                'complaints_total': counters["total"],
+                'complaints_resolved': counters["resolved"],
+                'complaints_rejected': counters["rejected"],
+                'bans_issued': counters["bans"],
+                'delays': counters["delays"]
+            })
+
+        for row in await self._count_appeals():
+            rows[row.pop("username")].update(row)
+
+        # Ручные правки сохраняются и для сотрудников без активности
+        custom_stats = load_custom_stats()
+        for username in custom_stats:
+            rows[username]
+
+        await self.session.execute(delete(StaffStats))
+        for username, counters in rows.items():
+            self.session.add(StaffStats(
+                username=username,
+                overrides=custom_stats.get(username),
+                **counters
+            ))
+        await self.session.flush()
+        await self.refresh_totals()
+        await self.ensure_snapshot()
+        return len(rows)
+
+    async def _count_appeals(self, *conditions) -> List[Dict]:
+        query = select(
+            User.username,
+            func.count(Appeal.id),
+            func.count(Appeal.id).filter(Appeal.status == AppealStatus.RESOLVED),
+            func.count(Appeal.id).filter(Appeal.status == AppealStatus.REJECTED)
+        ).join(
+            AppealAssignment,
+            AppealAssignment.appeal_id == Appeal.id
+        ).join(
+            User,
+            AppealAssignment.user_id == User.id
+        )
+        if conditions:
+            query = query.where(*conditions)
+
+        result = await self.session.execute(query.group_by(User.username))
+        return [
+            {"username": username, **dict(zip(APPEAL_COUNTERS, counters))}
+            for username, *counters in result.all()
+        ]
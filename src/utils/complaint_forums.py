@@ -0,0 +1,17 @@
+# Основные форумы жалоб и их закрытые разделы (с указанием статуса)
+PLAYER_COMPLAINT_FORUMS = {
+    37: {"name": "New York", "closed": {112: "Решено", 172: "Отклонено"}},
+    169: {"name": "Detroit", "closed": {173: "Решено", 174: "Отклонено"}},
+    247: {"name": "Chicago", "closed": {249: "Решено", 250: "Отклонено"}},
+    318: {"name": "San Francisco", "closed": {323: "Решено", 324: "Отклонено"}},
+    474: {"name": "Atlanta", "closed": {475: "Решено", 506: "Отклонено"}},
+    540: {"name": "San Diego", "closed": {543: "Решено", 544: "Отклонено"}},
+    652: {"name": "Los Angeles", "closed": {653: "Решено", 654: "Отклонено"}},
+    762: {"name": "Miami", "closed": {763: "Решено", 764: "Отклонено"}},
+    859: {"name": "Las Vegas", "closed": {862: "Решено", 863: "Отклонено"}},
+    936: {"name": "Washington", "closed": {937: "Решено", 938: "Отклонено"}},
+    994: {"name": "Dallas", "closed": {995: "Решено", 996: "Отклонено"}},
+    1059: {"name": "Boston", "closed": {1060: "Решено", 1061: "Отклонено"}},
+    1148: {"name": "Seattle", "closed": {1149: "Решено", 1150: "Отклонено"}},
+    1253: {"name": "Phoenix", "closed": {1254: "Решено", 1255: "Отклонено"}}
+}
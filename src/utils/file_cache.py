@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+import threading
+import json
+import os
+import sys
+
+from src.config import Config
+
+def parsed_size(data: Any) -> int:
+    """
+    Оценка памяти, занятой разобранным JSON: sys.getsizeof по всем
+    вложенным словарям, спискам и значениям (обычно в разы больше файла)
+    """
+    size = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return size
+
+class JsonFileCache:
+    """
+    Кэш разобранных JSON файлов в памяти процесса.
+    Запись считается актуальной, пока у файла не изменились mtime и размер.
+    Бюджет памяти считается по оценке размера разобранных данных
+    (parsed_size при записи в кэш), при превышении
+    вытесняются давно не использованные записи (LRU).
+    Возвращаемые данные общие для всех вызывающих - их нельзя изменять.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # путь -> (mtime_ns, размер файла, данные, оценка памяти)
+        self._entries: "OrderedDict[str, Tuple[int, int, Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, path: Union[str, Path]) -> Any:
+        """Возвращает содержимое файла, разбирая его только при изменении"""
+        key = str(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (entry[0], entry[1]) == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        with open(key, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        memory = parsed_size(data)
+
+        with self._lock:
+            self._drop(key)
+            if memory <= self.max_bytes:
+                self._entries[key] = (signature[0], signature[1], data, memory)
+                self._size += memory
+                while self._size > self.max_bytes:
+                    oldest = next(iter(self._entries))
+                    self._drop(oldest)
+                    self.evictions += 1
+        return data
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        with self._lock:
+            self._drop(str(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes
+            }
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._size -= entry[3]
+
+complaint_file_cache = JsonFileCache(Config.COMPLAINT_FILE_CACHE_MB * 1024 * 1024)
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Union
+from pathlib import Path
+from yarl import URL
+import aiohttp
+import asyncio
+import json
+import os
+
+from src.config import Config
+from src.utils.rate_limiter import HostRateLimiter, forum_rate_limiter
+from src.utils.page_cache import PageCache, forum_page_cache
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+COOKIES_FILE = "majestic_cookies.json"
+
+# Признак авторизованной страницы форума (блок профиля в шапке)
+MEMBER_MARKER = "p-navgroup--member"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах (форма с HTTP-датой не поддерживается)"""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+def load_cookie_file(path: Union[str, Path]) -> List[Dict]:
+    """Куки, сохраненные Selenium (список словарей name/value/domain/path)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        cookies = json.load(f)
+    return cookies if isinstance(cookies, list) else []
+
+class ForumClient:
+    """
+    Асинхронный HTTP-клиент форума поверх пула соединений aiohttp.
+    Использует сессию, сохраненную в majestic_cookies.json, число
+    одновременных соединений с одним хостом ограничено concurrency_per_host,
+    частота запросов - общим rate_limiter. Страницы кэшируются на диске
+    (page_cache) и перезапрашиваются условными запросами.
+    base_url можно направить на локальный сервер с записанными страницами.
+    """
+    def __init__(
+        self,
+        base_url: str = Config.FORUM_BASE_URL,
+        cookies_file: Union[str, Path] = COOKIES_FILE,
+        concurrency_per_host: int = Config.PARSER_CONCURRENCY_PER_HOST,
+        timeout: float = Config.PARSER_REQUEST_TIMEOUT,
+        rate_limiter: HostRateLimiter = forum_rate_limiter,
+        max_retries: int = Config.PARSER_MAX_RETRIES,
+        page_cache: Optional[PageCache] = forum_page_cache
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cookies_file = cookies_file
+        self.concurrency_per_host = concurrency_per_host
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.page_cache = page_cache
+        self.host = URL(self.base_url).host
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.requests = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+
+    def clone(self) -> "ForumClient":
+        """
+        Клиент с теми же настройками и своей HTTP-сессией. Ограничитель
+        частоты и кэш страниц общие, так что суммарная нагрузка на форум
+        не растет с числом клиентов.
+        """
+        return ForumClient(
+            base_url=self.base_url,
+            cookies_file=self.cookies_file,
+            concurrency_per_host=self.concurrency_per_host,
+            timeout=self.timeout,
+            rate_limiter=self.rate_limiter,
+            max_retries=self.max_retries,
+            page_cache=self.page_cache
+        )
+
+    async def __aenter__(self) -> "ForumClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        if self.session is not None:
+            return
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=self.concurrency_per_host),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT}
+        )
+        self.load_cookies()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def load_cookies(self) -> int:
+        """(Пере)загружает сохраненные куки в сессию"""
+        cookies = load_cookie_file(self.cookies_file)
+        for cookie in cookies:
+            if "name" not in cookie or "value" not in cookie:
+                continue
+            self.session.cookie_jar.update_cookies(
+                {cookie["name"]: cookie["value"]},
+                response_url=URL(self.base_url)
+            )
+        return len(cookies)
+
+    def url(self, path: str) -> str:
+        """Абсолютный адрес страницы форума"""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def fetch(self, url: str) -> str:
+        """
+        HTML страницы. Неизменяемые страницы из кэша отдаются без запроса,
+        для остальных закэшированных отправляется условный запрос
+        (If-None-Match/If-Modified-Since). Перед каждым запросом берется токен
+        у ограничителя хоста, 429/5xx и сетевые ошибки повторяются с паузой;
+        остальные ошибки HTTP пробрасываются как aiohttp.ClientResponseError.
+        """
+        url = self.url(url)
+        host = URL(url).host or self.host
+
+        cached = await asyncio.to_thread(self.page_cache.get, url) if self.page_cache else None
+        headers = {}
+        if cached:
+            if cached.get("immutable"):
+                body = await asyncio.to_thread(self.page_cache.read_body, url)
+                if body is not None:
+                    self.cache_hits += 1
+                    return body
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(host)
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    self.requests += 1
+                    if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                        attempt += 1
+                        pause = self.rate_limiter.throttle(host, parse_retry_after(response.headers.get("Retry-After")))
+                        print(f"Форум ответил {response.status} на {url}, пауза {pause:.1f} с")
+                        continue
+                    if response.status == 304 and headers:
+                        body = await asyncio.to_thread(self.page_cache.read_body, url)
+                        if body is not None:
+                            self.not_modified += 1
+                            self.rate_limiter.succeed(host)
+                            return body
+                        # Тело пропало из кэша - повторяем обычным запросом, попытка не расходуется
+                        headers = {}
+                        continue
+                    response.raise_for_status()
+                    body = await response.text()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                pause = self.rate_limiter.throttle(host)
+                print(f"Ошибка соединения при загрузке {url}: {e!r}, пауза {pause:.1f} с")
+                continue
+
+            self.rate_limiter.succeed(host)
+            if self.page_cache:
+                await asyncio.to_thread(self.page_cache.store, url, body, etag, last_modified)
+            return body
+
+    def mark_immutable(self, url: str) -> None:
+        """Страница больше не меняется - следующие загрузки обходятся без сети"""
+        if self.page_cache:
+            self.page_cache.mark_immutable(self.url(url))
+
+    async def is_authorized(self) -> bool:
+        """Проверка сессии по главной странице (без кэша - она зависит от авторизации)"""
+        try:
+            await self.rate_limiter.acquire(self.host)
+            async with self.session.get(self.base_url) as response:
+                self.requests += 1
+                response.raise_for_status()
+                return MEMBER_MARKER in await response.text()
+        except aiohttp.ClientError as e:
+            print(f"Не удалось загрузить главную страницу форума: {e}")
+            return False
@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from src.config import Config
+
+# Классы ников администрации (по ним определяются ответы администрации в теме)
+ADMIN_STYLES = ("username--style3", "username--style9", "username--style6")
+ADMIN_SELECTOR = ", ".join(f"span.{style}" for style in ADMIN_STYLES)
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+LISTING_THREADS_XPATH = f"//div[{_has_class('structItem--thread')}]"
+LISTING_TITLE_XPATH = ".//a[@data-tp-primary='on']"
+LISTING_DATE_XPATH = f".//li[{_has_class('structItem-startDate')}]//time[{_has_class('u-dt')}]"
+LISTING_NEXT_XPATH = f"//a[{_has_class('pageNav-jump--next')}]"
+MESSAGES_XPATH = f"//article[{_has_class('message')}]"
+TIME_XPATH = f".//time[{_has_class('u-dt')}]"
+FIRST_TIME_XPATH = f"//time[{_has_class('u-dt')}]"
+ADMIN_XPATH = ".//span[" + " or ".join(_has_class(style) for style in ADMIN_STYLES) + "]"
+TITLE_XPATH = f"//h1[{_has_class('p-title-value')}]"
+USERNAME_XPATH = f"//a[{_has_class('username')}]"
+
+def parse_forum_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("+0000", "+00:00").replace("+0300", "+03:00"))
+
+def format_duration(start_date: datetime, end_date: datetime) -> str:
+    duration = end_date - start_date
+    hours, remainder = divmod(duration.seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{duration.days}d {hours}h {minutes}m {seconds}s"
+
+def extract_listing(page_html: str) -> Dict:
+    """
+    Темы страницы листинга закрытого раздела: ссылка и дата создания
+    (в исходном виде атрибута datetime), плюс признак следующей страницы
+    """
+    tree = lxml_html.fromstring(page_html)
+    blocks = tree.xpath(LISTING_THREADS_XPATH)
+    threads = []
+    for block in blocks:
+        title_tags = block.xpath(LISTING_TITLE_XPATH)
+        date_tags = block.xpath(LISTING_DATE_XPATH)
+        if not title_tags or not date_tags:
+            continue
+        href = title_tags[0].get("href")
+        date_str = date_tags[0].get("datetime")
+        if href and date_str:
+            threads.append({"href": href, "datetime": date_str.replace("+0300", "+03:00")})
+
+    return {
+        "blocks": len(blocks),
+        "threads": threads,
+        "has_next": bool(tree.xpath(LISTING_NEXT_XPATH))
+    }
+
+def extract_thread(page_html: str) -> Optional[Dict]:
+    """
+    Разбор страницы закрытой темы через XPath lxml. Если разметка
+    не разбирается этим способом, используется BeautifulSoup.
+    None - на странице нет сообщений.
+    """
+    try:
+        return _extract_thread_lxml(page_html)
+    except Exception:
+        return _extract_thread_soup(page_html)
+
+def _text(elements: List) -> Optional[str]:
+    return elements[0].text_content().strip() if elements else None
+
+def _extract_thread_lxml(page_html: str) -> Optional[Dict]:
+    tree = lxml_html.fromstring(page_html)
+    messages = tree.xpath(MESSAGES_XPATH)
+    if not messages:
+        return None
+
+    admin_posts = [message for message in messages if message.xpath(ADMIN_XPATH)]
+    end_date = admin = None
+    if admin_posts:
+        closed_tags = admin_posts[-1].xpath(TIME_XPATH)
+        end_date = parse_forum_datetime(closed_tags[0].get("datetime")) if closed_tags else None
+        admin = _text(admin_posts[-1].xpath(ADMIN_XPATH))
+
+    duration_str = ""
+    if end_date:
+        start_date = parse_forum_datetime(tree.xpath(FIRST_TIME_XPATH)[0].get("datetime"))
+        duration_str = format_duration(start_date, end_date)
+
+    return {
+        "title": _text(tree.xpath(TITLE_XPATH)),
+        "author": _text(tree.xpath(USERNAME_XPATH)),
+        "admin": admin,
+        "endDate": end_date.isoformat() if end_date else None,
+        "durationFormatted": duration_str
+    }
+
+def _extract_thread_soup(page_html: str) -> Optional[Dict]:
+    soup = BeautifulSoup(page_html, "lxml")
+    messages = soup.select("article.message")
+    if not messages:
+        return None
+
+    admin_posts = [p for p in messages if p.select_one(ADMIN_SELECTOR)]
+    end_date = admin = None
+    if admin_posts:
+        closed_tag = admin_posts[-1].select_one("time.u-dt")
+        end_date = parse_forum_datetime(closed_tag['datetime']) if closed_tag else None
+
+        admin_tag = admin_posts[-1].select_one(ADMIN_SELECTOR)
+        admin = admin_tag.text.strip() if admin_tag else None
+
+    duration_str = ""
+    if end_date:
+        start_date = parse_forum_datetime(soup.select_one("time.u-dt")['datetime'])
+        duration_str = format_duration(start_date, end_date)
+
+    title_tag = soup.select_one("h1.p-title-value")
+    author_tag = soup.select_one("a.username")
+    return {
+        "title": title_tag.text.strip() if title_tag else None,
+        "author": author_tag.text.strip() if author_tag else None,
+        "admin": admin,
+        "endDate": end_date.isoformat() if end_date else None,
+        "durationFormatted": duration_str
+    }
+
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+def get_extract_pool() -> ProcessPoolExecutor:
+    """Общий пул процессов для разбора HTML (создается при первом обращении)"""
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(max_workers=Config.PARSER_EXTRACT_WORKERS)
+    return _extract_pool
+
+def shutdown_extract_pool() -> None:
+    global _extract_pool
+    if _extract_pool is not None:
+        _extract_pool.shutdown()
+        _extract_pool = None
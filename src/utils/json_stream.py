@@ -0,0 +1,100 @@
+from typing import Any, List, Union
+import codecs
+import json
+
+class JsonArrayStream:
+    """
+    Инкрементальный разбор JSON массива верхнего уровня.
+    Данные подаются кусками через feed(), который возвращает уже полностью
+    прочитанные элементы. В памяти держится только недочитанный хвост,
+    размер одного элемента ограничен max_item_bytes.
+    """
+    _WHITESPACE = " \t\r\n"
+    _NUMBER_START = "-0123456789"
+    _NUMBER_CHARS = "-+.eE0123456789"
+
+    def __init__(self, max_item_bytes: int = 1024 * 1024):
+        self.max_item_bytes = max_item_bytes
+        self.items_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._offset = 0
+        self._state = "start"
+
+    def feed(self, chunk: Union[bytes, str]) -> List[Any]:
+        if isinstance(chunk, bytes):
+            chunk = self._text_decoder.decode(chunk)
+        self._buffer += chunk
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Дочитывает остаток и проверяет, что массив закрыт"""
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._state == "start":
+            raise ValueError("Файл пуст или не содержит JSON массив")
+        if self._state != "done":
+            raise ValueError("Неожиданный конец файла: массив отчетов не закрыт")
+        return items
+
+    def _error(self, message: str, pos: int) -> ValueError:
+        return ValueError(f"{message} (позиция {self._offset + pos})")
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        pos = 0
+        length = len(buffer)
+
+        while True:
+            while pos < length and buffer[pos] in self._WHITESPACE:
+                pos += 1
+            if pos >= length:
+                break
+
+            char = buffer[pos]
+            if self._state == "start":
+                if char != "[":
+                    raise self._error("Файл должен содержать массив отчетов", pos)
+                self._state = "first"
+                pos += 1
+            elif self._state in ("first", "value"):
+                if char == "]" and self._state == "first":
+                    self._state = "done"
+                    pos += 1
+                    continue
+                # Число, доходящее до конца куска, могло быть обрезано ("4." + "5") - ждем продолжения
+                number_end = None
+                if char in self._NUMBER_START:
+                    number_end = pos
+                    while number_end < length and buffer[number_end] in self._NUMBER_CHARS:
+                        number_end += 1
+                    if number_end == length and not final:
+                        break
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if final or length - pos > self.max_item_bytes:
+                        raise self._error(f"Некорректный JSON в записи {self.items_read + 1}: {e.msg}", e.pos)
+                    break
+                if number_end is not None and end != number_end:
+                    raise self._error(f"Некорректный JSON в записи {self.items_read + 1}: неверное число", pos)
+                items.append(item)
+                self.items_read += 1
+                self._state = "separator"
+                pos = end
+            elif self._state == "separator":
+                if char == ",":
+                    self._state = "value"
+                elif char == "]":
+                    self._state = "done"
+                else:
+                    raise self._error(f"Ожидалась ',' или ']' после записи {self.items_read}", pos)
+                pos += 1
+            else:
+                raise self._error("Лишние данные после конца массива", pos)
+
+        self._offset += pos
+        self._buffer = buffer[pos:]
+        return items
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from typing import Dict
+import asyncio
+import uuid
+
+from sqlalchemy import update, values, column, or_, UUID, DateTime
+
+from src.config import Config
+from src.database import async_session
+from src.models.user_model import User
+
+class LastSeenBuffer:
+    """
+    Отложенная запись last_login: запросы только отмечают время в памяти
+    процесса (повторные отметки пользователя схлопываются), фоновая задача
+    раз в interval секунд пишет все отметки одним UPDATE ... FROM (VALUES ...).
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[uuid.UUID, datetime] = {}
+        self.flushed = 0
+
+    def touch(self, user_id: uuid.UUID) -> None:
+        self._pending[user_id] = datetime.now(timezone.utc)
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        seen = values(
+            column("id", UUID(as_uuid=True)),
+            column("last_login", DateTime(timezone=True)),
+            name="seen"
+        ).data(list(pending.items()))
+        stmt = (
+            update(User)
+            .where(User.id == seen.c.id)
+            .where(or_(User.last_login == None, User.last_login < seen.c.last_login))
+            .values(last_login=seen.c.last_login)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            async with async_session() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception:
+            # Отметки возвращаются в буфер, более свежие не затираются
+            for user_id, seen_at in pending.items():
+                self._pending.setdefault(user_id, seen_at)
+            raise
+
+        self.flushed += len(pending)
+        return len(pending)
+
+    async def run(self) -> None:
+        """Фоновая запись отметок (запускается при старте приложения)"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Ошибка при записи last_login: {str(e)}")
+
+last_seen = LastSeenBuffer(Config.LAST_LOGIN_FLUSH_SECONDS)
@@ -0,0 +1,128 @@
+from pathlib import Path
+from typing import Dict, Optional, Union
+from datetime import datetime
+import hashlib
+import json
+import os
+import time
+
+from src.config import Config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+class PageCache:
+    """
+    Дисковый кэш страниц форума по URL: тело страницы и заголовки
+    ETag/Last-Modified для условных запросов. Страница, помеченная
+    неизменяемой (разобранная закрытая тема), отдается без запроса к форуму.
+    Кэш лежит вне storage/, который раздается как статика.
+    Размер ограничивается prune(): изменяемые страницы (листинги) удаляются
+    по возрасту, при превышении бюджета - давно не читанные записи.
+    """
+    def __init__(self, root: Union[str, Path], max_bytes: int, mutable_max_age: float):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.mutable_max_age = mutable_max_age
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        directory = self.root / key[:2]
+        return directory / f"{key}.html", directory / f"{key}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Метаданные записи (url, etag, last_modified, immutable, fetched_at) или None"""
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+
+    def read_body(self, url: str) -> Optional[str]:
+        body_path, _ = self._paths(url)
+        try:
+            with open(body_path, "r", encoding="utf-8") as f:
+                body = f.read()
+            # mtime тела - время последнего использования для вытеснения
+            os.utime(body_path)
+            return body
+        except OSError:
+            return None
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        body_path, meta_path = self._paths(url)
+        os.makedirs(body_path.parent, exist_ok=True)
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps({
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "immutable": False,
+            "fetched_at": datetime.now().isoformat()
+        }, ensure_ascii=False))
+
+    def mark_immutable(self, url: str) -> None:
+        """Страница больше не меняется (закрытая тема успешно разобрана)"""
+        meta = self.get(url)
+        if meta is None or meta.get("immutable"):
+            return
+        _, meta_path = self._paths(url)
+        self._write(meta_path, json.dumps({**meta, "immutable": True}, ensure_ascii=False))
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Удаляет изменяемые записи старше mutable_max_age секунд, затем,
+        если кэш больше max_bytes, - записи с самым старым использованием
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+        for meta_path in self.root.glob("*/*.json"):
+            body_path = meta_path.with_suffix(".html")
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    immutable = bool(json.load(f).get("immutable"))
+                meta_stat = meta_path.stat()
+                body_stat = body_path.stat()
+            except (OSError, ValueError):
+                # Запись без тела или с битыми метаданными не используется
+                self._remove(meta_path, body_path)
+                removed += 1
+                continue
+
+            used_at = max(body_stat.st_mtime, meta_stat.st_mtime)
+            if not immutable and now - used_at > self.mutable_max_age:
+                self._remove(meta_path, body_path)
+                removed += 1
+                continue
+            entries.append((used_at, meta_stat.st_size + body_stat.st_size, meta_path, body_path))
+
+        total = sum(entry[1] for entry in entries)
+        entries.sort()
+        for _, size, meta_path, body_path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(meta_path, body_path)
+            total -= size
+            removed += 1
+        return {"removed": removed, "size_bytes": total}
+
+    def _remove(self, *paths: Path) -> None:
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _write(self, path: Path, content: str) -> None:
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+forum_page_cache = PageCache(
+    Config.PARSER_PAGE_CACHE_DIR or PROJECT_ROOT / ".parser_cache",
+    Config.PARSER_PAGE_CACHE_MB * 1024 * 1024,
+    Config.PARSER_PAGE_CACHE_MUTABLE_DAYS * 24 * 3600
+)
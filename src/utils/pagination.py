@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Any, List
+import base64
+import json
+import uuid
+
+from fastapi import HTTPException
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Курсор keyset-пагинации: значения ключа сортировки последней строки страницы,
+    упакованные в base64 JSON. Даты и UUID сохраняются с пометкой типа.
+    """
+    packed = []
+    for value in values:
+        if isinstance(value, datetime):
+            packed.append({"dt": value.isoformat()})
+        elif isinstance(value, uuid.UUID):
+            packed.append({"uuid": str(value)})
+        else:
+            packed.append(value)
+    raw = json.dumps(packed, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Разбор курсора, при ошибке - 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        packed = json.loads(raw.decode("utf-8"))
+        if not isinstance(packed, list) or len(packed) != size:
+            raise ValueError("Неверная длина курсора")
+
+        values = []
+        for value in packed:
+            if isinstance(value, dict) and "dt" in value:
+                values.append(datetime.fromisoformat(value["dt"]))
+            elif isinstance(value, dict) and "uuid" in value:
+                values.append(uuid.UUID(value["uuid"]))
+            else:
+                values.append(value)
+        return values
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Некорректный курсор пагинации")
+
+def split_page(rows: List[Any], per_page: int) -> tuple[List[Any], bool]:
+    """Строки страницы и признак следующей страницы (запрос выбирает per_page + 1 строк)"""
+    return rows[:per_page], len(rows) > per_page
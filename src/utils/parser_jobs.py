@@ -0,0 +1,60 @@
+from typing import Dict, Optional
+from datetime import datetime
+import json
+import uuid
+
+from src.redis_client import redis_client
+
+PARSER_QUEUE_KEY = "parser:jobs"
+PARSER_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+JOB_KINDS = ("daily", "backfill", "resume")
+
+def job_key(job_id: str) -> str:
+    return f"parser:job:{job_id}"
+
+def job_forums_key(job_id: str) -> str:
+    return f"parser:job:{job_id}:forums"
+
+async def enqueue_parser_job(kind: str, params: Dict, requested_by: Optional[str] = None) -> str:
+    """Ставит задачу парсера в очередь Redis, выполняет ее отдельный процесс (parser_worker)"""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Неизвестный тип задачи парсера: {kind}")
+
+    job_id = str(uuid.uuid4())
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), mapping={
+            "id": job_id,
+            "kind": kind,
+            "params": json.dumps(params),
+            "status": "queued",
+            "requested_by": requested_by or "",
+            "created_at": datetime.now().isoformat()
+        })
+        pipe.expire(job_key(job_id), PARSER_JOB_TTL_SECONDS)
+        pipe.rpush(PARSER_QUEUE_KEY, job_id)
+        await pipe.execute()
+    return job_id
+
+async def update_parser_job(job_id: str, **fields) -> None:
+    await redis_client.hset(job_key(job_id), mapping={key: str(value) for key, value in fields.items()})
+
+async def set_forum_progress(job_id: str, forum_id: int, progress: Dict) -> None:
+    """Прогресс задачи по форуму (статус, число тем, длительность)"""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_forums_key(job_id), str(forum_id), json.dumps(progress, ensure_ascii=False))
+        pipe.expire(job_forums_key(job_id), PARSER_JOB_TTL_SECONDS)
+        await pipe.execute()
+
+async def get_parser_job(job_id: str) -> Optional[Dict]:
+    job = await redis_client.hgetall(job_key(job_id))
+    if not job:
+        return None
+
+    forums = await redis_client.hgetall(job_forums_key(job_id))
+    job["params"] = json.loads(job.get("params") or "{}")
+    if job.get("summary"):
+        job["summary"] = json.loads(job["summary"])
+    job["forums"] = {forum_id: json.loads(progress) for forum_id, progress in forums.items()}
+    job["queue_length"] = await redis_client.llen(PARSER_QUEUE_KEY)
+    return job
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from passlib.context import CryptContext
+import asyncio
+import threading
+import time
+
+from src.config import Config
+
+class PasswordHasher:
+    """
+    Хэширование и проверка паролей bcrypt в ограниченном пуле потоков,
+    чтобы цикл событий (и веб-сокеты) не останавливался на время расчета.
+    Стоимость задается rounds; хэши с другой стоимостью пересчитываются
+    при успешном входе (verify_and_update).
+    """
+    def __init__(self, workers: int, rounds: int):
+        self.workers = workers
+        self.rounds = rounds
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rehashed = 0
+        self.wait_seconds = 0.0
+        self.work_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func: Callable, *args):
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.wait_seconds += started - submitted
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.work_seconds += time.perf_counter() - started
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, job)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Проверка пароля; при устаревшей стоимости вторым значением возвращается новый хэш"""
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "rehashed": self.rehashed,
+                "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 1) if self.completed else None,
+                "avg_work_ms": round(self.work_seconds / self.completed * 1000, 1) if self.completed else None
+            }
+
+password_hasher = PasswordHasher(Config.PASSWORD_HASH_WORKERS, Config.BCRYPT_ROUNDS)
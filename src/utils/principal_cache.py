@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import asyncio
+import copy
+import json
+import time
+import uuid
+
+from src.config import Config
+from src.redis_client import redis_client
+
+PRINCIPAL_CHANNEL = "principal:invalidate"
+INVALIDATE_ALL = "*"
+
+def principal_key(user_id) -> str:
+    return f"principal:{user_id}"
+
+def dump_entry(entry: Dict) -> str:
+    return json.dumps(entry, ensure_ascii=False, default=str)
+
+def load_entry(raw: str) -> Dict:
+    """Восстанавливает UUID и даты, которые JSON хранит строками"""
+    entry = json.loads(raw)
+    principal = entry["principal"]
+    principal["id"] = uuid.UUID(principal["id"])
+    principal["role"]["id"] = uuid.UUID(principal["role"]["id"])
+    if principal.get("created_at"):
+        principal["created_at"] = datetime.fromisoformat(principal["created_at"])
+    ban = entry.get("ban")
+    if ban and ban.get("expires_at"):
+        ban["expires_at"] = datetime.fromisoformat(ban["expires_at"])
+    return entry
+
+class PrincipalCache:
+    """
+    Кэш авторизованного пользователя для get_current_user: запись
+    (principal и активный бан) хранится в Redis с коротким TTL,
+    поверх него - L1 в памяти процесса с еще более коротким TTL.
+    Бан, разбан, смена роли и переопределения прав сбрасывают запись
+    через invalidate(), остальные процессы получают сброс из канала Redis.
+    """
+    def __init__(self, ttl: int, local_ttl: float, max_local: int = 10000):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_local = max_local
+        self._local: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    async def get(self, user_id) -> Optional[Dict]:
+        key = str(user_id)
+        entry = self._local.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._local.move_to_end(key)
+            self.local_hits += 1
+            return copy.deepcopy(entry[1])
+
+        try:
+            raw = await redis_client.get(principal_key(key))
+        except Exception as e:
+            print(f"Ошибка чтения кэша пользователя: {str(e)}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.redis_hits += 1
+        entry = load_entry(raw)
+        self._set_local(key, entry)
+        return copy.deepcopy(entry)
+
+    async def set(self, user_id, entry: Dict) -> None:
+        key = str(user_id)
+        self._set_local(key, copy.deepcopy(entry))
+        try:
+            await redis_client.setex(principal_key(key), self.ttl, dump_entry(entry))
+        except Exception as e:
+            print(f"Ошибка записи кэша пользователя: {str(e)}")
+
+    async def invalidate(self, *user_ids) -> None:
+        keys = [str(user_id) for user_id in user_ids]
+        for key in keys:
+            self._local.pop(key, None)
+        if not keys:
+            return
+        try:
+            await redis_client.delete(*(principal_key(key) for key in keys))
+            for key in keys:
+                await redis_client.publish(PRINCIPAL_CHANNEL, key)
+        except Exception as e:
+            print(f"Ошибка при сбросе кэша пользователя: {str(e)}")
+
+    async def listen(self) -> None:
+        """Сбрасывает L1 по сообщениям других процессов (запускается при старте приложения)"""
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(PRINCIPAL_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    if message["data"] == INVALIDATE_ALL:
+                        self._local.clear()
+                    else:
+                        self._local.pop(message["data"], None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Пока подписки нет, сбросы могли быть пропущены
+                print(f"Ошибка подписки на сброс кэша пользователей: {str(e)}")
+                self._local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "local_entries": len(self._local)
+        }
+
+    def _set_local(self, key: str, entry: Dict) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, entry)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local:
+            self._local.popitem(last=False)
+
+principal_cache = PrincipalCache(Config.PRINCIPAL_CACHE_TTL_SECONDS, Config.PRINCIPAL_LOCAL_TTL_SECONDS)
@@ -0,0 +1,101 @@
+from typing import Dict, Optional
+import asyncio
+import random
+import time
+
+from src.config import Config
+
+class TokenBucket:
+    """
+    Ведро токенов для одного хоста. Ожидание токена - asyncio.sleep,
+    цикл событий не блокируется. Скорость адаптивная: ответ 429/5xx
+    вдвое снижает ее и приостанавливает запросы (Retry-After или
+    экспоненциальная пауза), успешные ответы постепенно возвращают
+    ее к заданной.
+    """
+    def __init__(self, rate: float, burst: int, min_rate: float, max_backoff: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, retry_after: Optional[float] = None) -> float:
+        """Реакция на 429/5xx: снижение скорости и пауза, возвращает длительность паузы"""
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.backoff = min(self.max_backoff, self.backoff * 2 if self.backoff else 1.0)
+        pause = max(self.backoff, retry_after or 0)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+        self.tokens = 0.0
+        return pause
+
+    def succeed(self) -> None:
+        self.backoff = 0.0
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+class HostRateLimiter:
+    """Ограничение частоты запросов по хостам со случайной задержкой (jitter)"""
+    def __init__(
+        self,
+        rate: float = Config.PARSER_RATE_PER_SECOND,
+        burst: int = Config.PARSER_BURST,
+        jitter: float = Config.PARSER_JITTER_SECONDS,
+        max_backoff: float = Config.PARSER_MAX_BACKOFF_SECONDS
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(
+                rate=self.rate,
+                burst=self.burst,
+                min_rate=self.rate / 8,
+                max_backoff=self.max_backoff
+            )
+        return bucket
+
+    async def acquire(self, host: str) -> None:
+        await self.bucket(host).acquire()
+        if self.jitter:
+            await asyncio.sleep(random.uniform(0, self.jitter))
+
+    def throttle(self, host: str, retry_after: Optional[float] = None) -> float:
+        return self.bucket(host).throttle(retry_after)
+
+    def succeed(self, host: str) -> None:
+        self.bucket(host).succeed()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            host: {"rate": round(bucket.rate, 3), "backoff": bucket.backoff}
+            for host, bucket in self._buckets.items()
+        }
+
+# Общий бюджет вежливости для всех клиентов форума в процессе
+forum_rate_limiter = HostRateLimiter()
@@ -1,11 +1,101 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
 import uuid
 
 from src.models.user_model import UserPermissionOverride
 from src.models.role_model import PermissionLevel, PermissionType
 from src.models.appeal_model import AppealAssignmentHistory
 from src.database import  get_session
+from src.utils.principal_cache import principal_cache
+
+# Право, дающее доступ к новым обращениям каждого типа
+APPEAL_TYPE_PERMISSIONS = {
+    "help": "respond_support_tickets",
+    "complaint": "respond_moderation_complaints",
+    "amnesty": "respond_amnesty_requests",
+}
+APPEAL_TYPES = tuple(APPEAL_TYPE_PERMISSIONS)
+APPEAL_TYPE_INDEX = {appeal_type: index for index, appeal_type in enumerate(APPEAL_TYPES)}
+CLOSED_STATUSES = frozenset(["resolved", "rejected"])
+
+PERMISSION_BITS = {permission.value: 1 << index for index, permission in enumerate(PermissionType)}
+VIEW_ACTIVE_CHATS_BIT = PERMISSION_BITS[PermissionType.VIEW_ACTIVE_CHATS.value]
+
+@dataclass(frozen=True)
+class CompiledPermissions:
+    """
+    Итоговые права пользователя, собранные один раз при авторизации.
+    granted - явные права роли с учетом переопределений (has_permission_by_name),
+    granted_by_level - то же, но без явного значения право дает уровень роли
+    (has_permission). statuses - доступные статусы по типам из APPEAL_TYPES.
+    """
+    level: int
+    granted: int
+    granted_by_level: int
+    appeal_types: Tuple[str, ...]
+    statuses: Tuple[FrozenSet[str], ...]
+    other_statuses: FrozenSet[str]
+
+    def allowed_statuses(self, appeal_type: str) -> FrozenSet[str]:
+        index = APPEAL_TYPE_INDEX.get(appeal_type)
+        return self.other_statuses if index is None else self.statuses[index]
+
+def compile_permissions(user: dict) -> Optional[CompiledPermissions]:
+    """Собирает битовые маски прав и доступные типы/статусы обращений"""
+    role = user.get("role")
+    if not role:
+        return None
+
+    overrides = (user.get("override_permission") or {}).get("permissions") or {}
+    role_permissions = role.get("permissions") or {}
+
+    granted = granted_by_level = 0
+    for permission in PermissionType:
+        bit = PERMISSION_BITS[permission.value]
+        if overrides.get(permission.value) is not None:
+            explicit = overrides[permission.value]
+            by_level = explicit
+        elif permission.value in role_permissions:
+            explicit = by_level = role_permissions[permission.value]
+        else:
+            explicit = False
+            by_level = role["level"] >= permission.level.value
+        if explicit:
+            granted |= bit
+        if by_level:
+            granted_by_level |= bit
+
+    view_active_chats = bool(granted & VIEW_ACTIVE_CHATS_BIT)
+    other_statuses = CLOSED_STATUSES | ({"pending", "in_progress"} if view_active_chats else set())
+    statuses = tuple(
+        other_statuses | ({"pending"} if granted & PERMISSION_BITS[APPEAL_TYPE_PERMISSIONS[appeal_type]] else set())
+        for appeal_type in APPEAL_TYPES
+    )
+    if view_active_chats:
+        appeal_types = APPEAL_TYPES
+    else:
+        appeal_types = tuple(
+            appeal_type for appeal_type in APPEAL_TYPES
+            if granted & PERMISSION_BITS[APPEAL_TYPE_PERMISSIONS[appeal_type]]
+        )
+
+    return CompiledPermissions(
+        level=role["level"],
+        granted=granted,
+        granted_by_level=granted_by_level,
+        appeal_types=appeal_types,
+        statuses=statuses,
+        other_statuses=frozenset(other_statuses)
+    )
+
+def permissions_of(user: dict) -> Optional[CompiledPermissions]:
+    """Права, собранные при авторизации (user["access"]), иначе собираются на месте"""
+    access = user.get("access")
+    if isinstance(access, CompiledPermissions):
+        return access
+    return compile_permissions(user)
 
 class SecurityUtils:
     @staticmethod
@@ -25,38 +115,23 @@ class SecurityUtils:
 
     @staticmethod
     def has_permission(user: dict, permission: PermissionType) -> bool:
-        """Проверяет конкретное право с учетом переопределений"""
-        if not user.get("role"):
+        """Проверяет конкретное право с учетом переопределений и уровня роли"""
+        access = permissions_of(user)
+        if access is None:
             return False
-
-        # Проверяем переопределения прав пользователя
-        if user.get("override_permission"):
-            override_value = user["override_permission"]["permissions"].get(permission.value[0])
-            if override_value is not None:
-                return override_value
-
-        # Проверяем права роли
-        role = user["role"]
-        permissions = role.get("permissions", {})
-        
-        if permission.value[0] in permissions:
-            return permissions[permission.value[0]]
-        
-        return role["level"] >= permission.value[1].value
+        return bool(access.granted_by_level & PERMISSION_BITS[permission.value])
 
     @staticmethod
     def can_view_appeal_type(user: dict, appeal_type: str) -> bool:
         """Проверяет, может ли пользователь видеть обращения данного типа"""
-        from src.security_middleware import AppealPermissionChecker
-        allowed_types = AppealPermissionChecker.get_allowed_appeal_types(user)
-        return appeal_type in allowed_types
+        access = permissions_of(user)
+        return access is not None and appeal_type in access.appeal_types
 
     @staticmethod
     def can_view_appeal_status(user: dict, appeal_type: str, appeal_status: str) -> bool:
         """Проверяет, может ли пользователь видеть обращения данного типа и статуса"""
-        from src.security_middleware import AppealPermissionChecker
-        allowed_statuses = AppealPermissionChecker.get_allowed_statuses(user, appeal_type)
-        return appeal_status in allowed_statuses
+        access = permissions_of(user)
+        return access is not None and appeal_status in access.allowed_statuses(appeal_type)
     
     @staticmethod
     def check_permission(user: dict, permission: PermissionType) -> None:
@@ -70,7 +145,11 @@ class SecurityUtils:
         if not user.get("role"):
             return False
 
-        # Сначала проверяем переопределения прав пользователя
+        bit = PERMISSION_BITS.get(permission_name)
+        if bit is not None:
+            return bool(permissions_of(user).granted & bit)
+
+        # Права вне PermissionType проверяются по словарям роли и переопределений
         if user.get("override_permission"):
             override_value = user["override_permission"]["permissions"].get(permission_name)
             if override_value is not None:
@@ -147,11 +226,18 @@ class SecurityUtils:
         permission: str,
         value: bool
     ) -> None:
-        """Устанавливает переопределение права для пользователя"""
+        """
+        Устанавливает переопределение права для пользователя и фиксирует его.
+        Кэш пользователя сбрасывается только после коммита: иначе параллельный
+        запрос успел бы закэшировать прежнее значение из базы.
+        """
         override = await session.get(UserPermissionOverride, user_id)
         if not override:
             override = UserPermissionOverride(user_id=user_id, permissions={})
             session.add(override)
         
-        override.permissions[permission] = value
-        override.updated_at = func.now()
\ No newline at end of file
+        # Изменение вложенного ключа JSON не отслеживается, поэтому словарь заменяется
+        override.permissions = {**override.permissions, permission: value}
+        override.updated_at = func.now()
+        await session.commit()
+        await principal_cache.invalidate(user_id)
\ No newline at end of file
@@ -198,7 +198,12 @@ function initAppealsListWebSocket() {
         }
     };
     
-    appealsListSocket.onclose = function() {
+    appealsListSocket.onclose = function(event) {
+        // 4401-4404: нет токена, токен недействителен, бан, пользователь не найден
+        if (event.code >= 4401 && event.code <= 4404) {
+            console.warn('WebSocket для списка обращений закрыт:', event.code, event.reason);
+            return;
+        }
         console.log('WebSocket для списка обращений отключен, переподключение через 3 секунды...');
         setTimeout(initAppealsListWebSocket, 3000);
     };
@@ -63,6 +63,23 @@ let searchQueries = {
     userReports: ''
 };
 
+// Курсоры keyset-пагинации: при переходе на следующую страницу сервер
+// продолжает выборку с последней строки, а не пропускает строки через OFFSET
+const pageCursors = {};
+
+function appendPageParams(list, params, page, perPage) {
+    params.append('per_page', perPage);
+    const filterKey = `${list}?${params.toString()}`;
+    params.append('page', page);
+    const cursor = pageCursors[`${filterKey}#${page}`];
+    if (cursor) params.append('cursor', cursor);
+    return filterKey;
+}
+
+function rememberNextCursor(filterKey, page, nextCursor) {
+    if (nextCursor) pageCursors[`${filterKey}#${page + 1}`] = nextCursor;
+}
+
 const searchInputs = {
     complaints: document.getElementById('complaints-search-input'),
     appeals: document.getElementById('appeals-search-input'),
@@ -128,8 +145,7 @@ async function loadComplaints(page = currentFilters.page) {
         if (currentFilters.status !== 'all') params.append('status', currentFilters.status);
         if (currentFilters.date) params.append('date', currentFilters.date);
         if (searchQueries.complaints) params.append('admin', searchQueries.complaints);
-        params.append('page', currentFilters.page);
-        params.append('per_page', currentFilters.perPage);
+        const filterKey = appendPageParams('complaints', params, currentFilters.page, currentFilters.perPage);
 
         const response = await fetch(`/dashboard/admin/reports/complaints?${params.toString()}`, {
             credentials: 'include'
@@ -138,6 +154,7 @@ async function loadComplaints(page = currentFilters.page) {
         if (!response.ok) throw new Error('Ошибка загрузки жалоб');
 
         const data = await response.json();
+        rememberNextCursor(filterKey, currentFilters.page, data.next_cursor);
         renderComplaints(data);
     } catch (error) {
         reportsList.innerHTML = `
@@ -219,9 +236,8 @@ async function loadDelays(page = 1) {
 
     try {
         const params = new URLSearchParams();
-        params.append('page', page);
-        params.append('per_page', currentFilters.perPage);
         if (searchQueries.delays) params.append('admin', searchQueries.delays);
+        const filterKey = appendPageParams('delays', params, page, currentFilters.perPage);
 
         const response = await fetch(`/dashboard/admin/reports/delayed-complaints?${params.toString()}`, {
             credentials: 'include'
@@ -230,6 +246,7 @@ async function loadDelays(page = 1) {
         if (!response.ok) throw new Error('Ошибка загрузки просроченных жалоб');
 
         const data = await response.json();
+        rememberNextCursor(filterKey, page, data.next_cursor);
         renderDelays(data);
     } catch (error) {
         reportsList.innerHTML = `
@@ -322,8 +339,7 @@ async function loadAppeals(page = currentAppealFilters.page) {
             params.append('moderator', searchQueries.appeals);
         }
         
-        params.append('page', currentAppealFilters.page);
-        params.append('per_page', currentAppealFilters.perPage);
+        const filterKey = appendPageParams('appeals', params, currentAppealFilters.page, currentAppealFilters.perPage);
         
         const response = await fetch(`/dashboard/admin/reports/appeal-stats?${params.toString()}`, {
             credentials: 'include'
@@ -332,6 +348,7 @@ async function loadAppeals(page = currentAppealFilters.page) {
         if (!response.ok) throw new Error('Ошибка загрузки обращений');
 
         const data = await response.json();
+        rememberNextCursor(filterKey, currentAppealFilters.page, data.next_cursor);
         renderAppeals(data);
     } catch (error) {
         reportsList.innerHTML = `
@@ -880,7 +897,6 @@ document.querySelector('.confirm-upload-btn').addEventListener('click', async ()
     try {
         const formData = new FormData();
         formData.append('reports_file', selectedFile.file);
-        formData.append('file_content', selectedFile.content);  
 
         const response = await fetch('/dashboard/admin/reports/upload-reports', {
             method: 'POST',
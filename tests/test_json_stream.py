@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from src.utils.json_stream import JsonArrayStream
+
+def read_chunks(chunks, **kwargs):
+    stream = JsonArrayStream(**kwargs)
+    items = []
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+    items.extend(stream.close())
+    return items
+
+def split_every(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+DOCUMENT = json.dumps(
+    [
+        {"report_id": "1", "admin": "Иван", "title": "бан \"читера\"", "delay": 1.5},
+        -1e3,
+        4.5,
+        0,
+        True,
+        None,
+        "строка, с ] и [",
+        [1, [2, {"a": []}]],
+    ],
+    ensure_ascii=False
+)
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_any_text_chunking_gives_same_items(size):
+    assert read_chunks(split_every(DOCUMENT, size)) == json.loads(DOCUMENT)
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_utf8_bytes_split_inside_characters(size):
+    data = ("﻿" + DOCUMENT).encode("utf-8")
+    assert read_chunks(split_every(data, size)) == json.loads(DOCUMENT)
+
+@pytest.mark.parametrize("chunks, expected", [
+    (["[4.", "5, {\"a\":1}", ", -1", "e3]"], [4.5, {"a": 1}, -1000.0]),
+    (["[12", "34]"], [1234]),
+    (["[1", "]"], [1]),
+    (["[-", "0.5]"], [-0.5]),
+    (["[tr", "ue, nu", "ll]"], [True, None]),
+])
+def test_values_split_across_chunks(chunks, expected):
+    assert read_chunks(chunks) == expected
+
+def test_items_are_returned_as_soon_as_complete():
+    stream = JsonArrayStream()
+    assert stream.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert stream.feed(': 2}]') == [{"b": 2}]
+    assert stream.close() == []
+    assert stream.items_read == 2
+
+def test_empty_array():
+    assert read_chunks(["[", " ", "]"]) == []
+
+@pytest.mark.parametrize("chunks, message", [
+    ([""], "пуст"),
+    (["{}"], "массив"),
+    (["[1, 2"], "не закрыт"),
+    (["[1 2]"], "Ожидалась"),
+    (["[1] 2"], "Лишние данные"),
+    (["[1.2.3]"], "неверное число"),
+    (["[{\"a\": }]"], "Некорректный JSON в записи 1"),
+])
+def test_malformed_input(chunks, message):
+    with pytest.raises(ValueError, match=message):
+        read_chunks(chunks)
+
+def test_error_position_counts_consumed_chunks():
+    with pytest.raises(ValueError, match=r"позиция 7\)"):
+        read_chunks(["[1, 2, ", "x]"])
+
+def test_item_larger_than_limit_fails_before_array_ends():
+    stream = JsonArrayStream(max_item_bytes=16)
+    stream.feed("[")
+    with pytest.raises(ValueError, match="Некорректный JSON"):
+        stream.feed('"' + "x" * 32)
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+
+fastapi = pytest.importorskip("fastapi")
+
+from src.utils.pagination import encode_cursor, decode_cursor, split_page
+
+@pytest.mark.parametrize("values", [
+    (datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc), "12345"),
+    (datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=3))), 7),
+    (datetime(2026, 3, 1, 12, 30), uuid.UUID("12345678-1234-5678-1234-567812345678")),
+    (None, "report"),
+    (48, "Жалоба"),
+])
+def test_cursor_round_trip(values):
+    decoded = decode_cursor(encode_cursor(*values), len(values))
+    assert decoded == list(values)
+    assert [type(value) for value in decoded] == [type(value) for value in values]
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(datetime(2026, 3, 1, tzinfo=timezone.utc), "ё" * 5)
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    encode_cursor(1),
+    encode_cursor(1, 2, 3),
+    encode_cursor({"dt": "not a date"}, 1),
+    encode_cursor({"uuid": "not a uuid"}, 1),
+])
+def test_bad_cursor_is_400(cursor):
+    with pytest.raises(fastapi.HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+@pytest.mark.parametrize("rows, per_page, expected", [
+    ([1, 2, 3], 2, ([1, 2], True)),
+    ([1, 2], 2, ([1, 2], False)),
+    ([], 2, ([], False)),
+])
+def test_split_page(rows, per_page, expected):
+    assert split_page(rows, per_page) == expected
@@ -0,0 +1,92 @@
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("asyncpg")
+# Модуль прав импортирует src.database, которому нужен адрес базы (соединение не открывается)
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "postgresql+asyncpg://test@localhost/test")
+
+from src.models.role_model import PermissionLevel, PermissionType
+from src.utils.security import (
+    CLOSED_STATUSES,
+    CompiledPermissions,
+    SecurityUtils,
+    compile_permissions,
+    permissions_of,
+)
+
+def make_user(level, permissions=None, overrides=None):
+    return {
+        "id": uuid.uuid4(),
+        "role": {"id": uuid.uuid4(), "level": level, "permissions": permissions or {}, "name": "role"},
+        "override_permission": {"permissions": overrides} if overrides is not None else None,
+    }
+
+def test_user_without_role_has_no_permissions():
+    user = {"id": uuid.uuid4(), "role": None}
+    assert compile_permissions(user) is None
+    assert not SecurityUtils.has_permission(user, PermissionType.SUPPORT_REPLY)
+    assert not SecurityUtils.can_view_appeal_type(user, "help")
+
+def test_level_grants_permissions_without_explicit_entries():
+    access = compile_permissions(make_user(PermissionLevel.MODERATOR_SUPERVISOR.value))
+    user = {"access": access}
+    for permission in PermissionType:
+        expected = permission.level.value <= PermissionLevel.MODERATOR_SUPERVISOR.value
+        assert SecurityUtils.has_permission(user, permission) is expected
+    # Типы и статусы обращений открываются только явными правами
+    assert access.appeal_types == ()
+    assert access.allowed_statuses("help") == CLOSED_STATUSES
+
+def test_role_permission_opens_appeal_type():
+    access = compile_permissions(make_user(
+        PermissionLevel.JUNIOR_MODERATOR.value,
+        permissions={PermissionType.SUPPORT_REPLY.value: True}
+    ))
+    assert access.appeal_types == ("help",)
+    assert access.allowed_statuses("help") == CLOSED_STATUSES | {"pending"}
+    assert access.allowed_statuses("complaint") == CLOSED_STATUSES
+    assert access.allowed_statuses("unknown") == CLOSED_STATUSES
+
+def test_explicit_false_beats_role_level():
+    user = make_user(
+        PermissionLevel.EXECUTIVE_MODERATOR.value,
+        permissions={PermissionType.MANAGE_USERS.value: False}
+    )
+    assert not SecurityUtils.has_permission(user, PermissionType.MANAGE_USERS)
+    assert SecurityUtils.has_permission(user, PermissionType.MANAGE_ROLES)
+
+def test_override_beats_role_permission_and_level():
+    user = make_user(
+        PermissionLevel.USER.value,
+        permissions={PermissionType.SUPPORT_REPLY.value: True},
+        overrides={
+            PermissionType.SUPPORT_REPLY.value: False,
+            PermissionType.RESPOND_AMNESTY_REQUESTS.value: True,
+            PermissionType.MANAGE_REPORTS.value: None,
+        }
+    )
+    access = compile_permissions(user)
+    assert access.appeal_types == ("amnesty",)
+    assert not SecurityUtils.has_permission(user, PermissionType.SUPPORT_REPLY)
+    assert SecurityUtils.has_permission(user, PermissionType.RESPOND_AMNESTY_REQUESTS)
+    # None в переопределении не задает значение - действует уровень роли
+    assert not SecurityUtils.has_permission(user, PermissionType.MANAGE_REPORTS)
+
+def test_view_active_chats_opens_all_types_and_active_statuses():
+    access = compile_permissions(make_user(
+        PermissionLevel.USER.value,
+        overrides={PermissionType.VIEW_ACTIVE_CHATS.value: True}
+    ))
+    assert access.appeal_types == ("help", "complaint", "amnesty")
+    for appeal_type in access.appeal_types:
+        assert access.allowed_statuses(appeal_type) == CLOSED_STATUSES | {"pending", "in_progress"}
+
+def test_compiled_permissions_are_reused():
+    user = make_user(PermissionLevel.MODERATOR.value)
+    access = compile_permissions(user)
+    assert isinstance(access, CompiledPermissions)
+    assert permissions_of({**user, "access": access}) is access
+    assert permissions_of(user) == access